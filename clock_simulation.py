@@ -1,9 +1,35 @@
 import sys
 import math
+import cmath
+import time
 from PyQt6.QtWidgets import QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel
-from PyQt6.QtCore import QTimer, Qt
-from PyQt6.QtGui import QPainter, QPen, QBrush, QFont
-from PyQt6.QtCore import QPointF
+from PyQt6.QtCore import QTimer, Qt, QEvent
+from PyQt6.QtGui import QPainter, QPen, QBrush, QFont, QPixmap
+from PyQt6.QtCore import QPointF, QRectF, QLineF
+
+# 表盘数字和重合提示的字体，所有帧共用
+_TICK_FONT = QFont("Arial", 12, QFont.Weight.Bold)
+_COINCIDE_FONT = QFont("Arial", 16, QFont.Weight.Bold)
+
+# 模拟速度：每秒真实时间推进的模拟分钟数
+_SIM_SPEED = 1.0
+
+# 动画刷新间隔（毫秒），接近显示器刷新率
+_FRAME_MS = 16
+
+# 每帧推进的模拟分钟数，以及对应的分针/时针单位旋转因子
+_STEP_MINUTES = _SIM_SPEED * _FRAME_MS / 1000
+_MINUTE_STEP = cmath.exp(1j * math.radians(6 * _STEP_MINUTES))
+_HOUR_STEP = cmath.exp(1j * math.radians(0.5 * _STEP_MINUTES))
+
+# 累乘多少步后重新归一化，抵消浮点误差
+_RENORM_STEPS = 256
+
+# 两针夹角小于1度视为重合；相对角速度5.5度/分钟，对应时间差 1/5.5 分钟
+_COINCIDE_MINUTES = 1 / 5.5
+
+# 12个刻度方向的(sin, cos)，每30度一个
+_TICK_SC = tuple((math.sin(i * math.pi / 6), math.cos(i * math.pi / 6)) for i in range(12))
 
 class ClockWidget(QWidget):
     def __init__(self):
@@ -12,74 +38,144 @@ class ClockWidget(QWidget):
         self.start_hour = 6  # 起始时间6点
         self.setMinimumSize(400, 400)
         
-    def paintEvent(self, event):
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        # 缓存的表盘位图铺满整个控件，无需Qt先擦除背景
+        self.setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent)
+        self.setAttribute(Qt.WidgetAttribute.WA_NoSystemBackground)
         
-        # 获取窗口中心和半径
-        center = QPointF(self.width() / 2, self.height() / 2)
+        # 静态表盘缓存，只在尺寸变化时重建
+        self._face_pixmap = None
+        self._face_size = None
+        
+        # 是否显示重合提示，由模拟按理论重合时刻设置
+        self.show_coincidence = False
+        
+        # 指针方向用单位复数表示：实部为cos，虚部为sin（从12点顺时针）
+        self.set_minutes(0)
+    
+    def set_minutes(self, minutes):
+        """直接设置经过的分钟数，精确重算指针方向"""
+        self.current_minutes = minutes
+        total_minutes = self.start_hour * 60 + minutes
+        
+        # 分针：每分钟6度；时针：每小时30度，每分钟0.5度
+        self._minute_z = cmath.exp(1j * math.radians((total_minutes % 60) * 6))
+        self._hour_z = cmath.exp(1j * math.radians((total_minutes % 720) * 0.5))
+        self._steps = 0
+    
+    def advance(self, steps):
+        """按固定步长推进若干帧，指针方向只做复数乘法"""
+        self._minute_z *= _MINUTE_STEP ** steps
+        self._hour_z *= _HOUR_STEP ** steps
+        self.current_minutes += steps * _STEP_MINUTES
+        
+        self._steps += steps
+        if self._steps >= _RENORM_STEPS:
+            self._minute_z /= abs(self._minute_z)
+            self._hour_z /= abs(self._hour_z)
+            self._steps = 0
+    
+    def resizeEvent(self, event):
+        # 尺寸变化后表盘缓存失效
+        self._face_pixmap = None
+        self._face_size = None
+        super().resizeEvent(event)
+    
+    def changeEvent(self, event):
+        # 调色板变化后背景色不同，需要重建表盘
+        if event.type() == QEvent.Type.PaletteChange:
+            self._face_size = None
+        super().changeEvent(event)
+    
+    def hands_rect(self):
+        """指针扫过的区域加上重合提示文字，作为局部重绘范围"""
+        cx, cy = self.width() / 2, self.height() / 2
         radius = min(self.width(), self.height()) / 2 - 20
         
+        # 分针长度加上笔宽余量
+        reach = radius * 0.7 + 8
+        hands = QRectF(cx - reach, cy - reach, 2 * reach, 2 * reach)
+        text = QRectF(cx - 60, cy + radius + 5, 180, 35)
+        return hands.united(text).toAlignedRect()
+    
+    def update_hands(self):
+        """只重绘指针区域，表盘其余部分保持不变"""
+        self.update(self.hands_rect())
+    
+    def build_face_pixmap(self, center, radius):
+        """把外圈、刻度和数字绘制到缓存位图中"""
+        ratio = self.devicePixelRatioF()
+        pixmap = QPixmap(round(self.width() * ratio), round(self.height() * ratio))
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(self.palette().window().color())
+        
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        
         # 绘制时钟外圈
         painter.setPen(QPen(Qt.GlobalColor.black, 3))
         painter.drawEllipse(center, radius, radius)
         
         # 绘制时钟刻度
         painter.setPen(QPen(Qt.GlobalColor.black, 2))
-        for i in range(12):
-            angle = i * 30 * math.pi / 180  # 每小时30度
-            x1 = center.x() + (radius - 20) * math.sin(angle)
-            y1 = center.y() - (radius - 20) * math.cos(angle)
-            x2 = center.x() + radius * math.sin(angle)
-            y2 = center.y() - radius * math.cos(angle)
-            painter.drawLine(QPointF(x1, y1), QPointF(x2, y2))
-            
-            # 绘制数字
-            painter.setFont(QFont("Arial", 12, QFont.Weight.Bold))
-            text_x = center.x() + (radius - 35) * math.sin(angle) - 8
-            text_y = center.y() - (radius - 35) * math.cos(angle) + 5
+        painter.setFont(_TICK_FONT)
+        cx, cy = center.x(), center.y()
+        inner = radius - 20
+        tick_lines = [QLineF(cx + inner * s, cy - inner * c, cx + radius * s, cy - radius * c)
+                      for s, c in _TICK_SC]
+        painter.drawLines(tick_lines)
+        
+        # 绘制数字
+        for i, (s, c) in enumerate(_TICK_SC):
+            text_x = cx + (radius - 35) * s - 8
+            text_y = cy - (radius - 35) * c + 5
             hour_num = 12 if i == 0 else i
             painter.drawText(QPointF(text_x, text_y), str(hour_num))
         
-        # 计算当前时间
-        total_minutes = self.start_hour * 60 + self.current_minutes
-        current_hour = (total_minutes // 60) % 12
-        current_minute = total_minutes % 60
+        painter.end()
+        self._face_pixmap = pixmap
+        self._face_size = self.size()
+        
+    def paintEvent(self, event):
+        # 常用的全局名和属性链先绑定为局部变量
+        point = QPointF
+        pen = QPen
+        colors = Qt.GlobalColor
+        width, height = self.width(), self.height()
+        
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        
+        # 获取窗口中心和半径
+        cx, cy = width / 2, height / 2
+        center = point(cx, cy)
+        radius = min(width, height) / 2 - 20
         
-        # 计算指针角度
-        # 分针：每分钟6度
-        minute_angle = current_minute * 6 * math.pi / 180
+        # 静态表盘直接贴缓存位图
+        if self._face_size != self.size():
+            self.build_face_pixmap(center, radius)
+        painter.drawPixmap(0, 0, self._face_pixmap)
         
-        # 时针：每小时30度，每分钟0.5度
-        hour_angle = (current_hour * 30 + current_minute * 0.5) * math.pi / 180
+        hour_z = self._hour_z
+        minute_z = self._minute_z
         
         # 绘制时针
-        painter.setPen(QPen(Qt.GlobalColor.red, 6))
+        painter.setPen(pen(colors.red, 6))
         hour_length = radius * 0.5
-        hour_x = center.x() + hour_length * math.sin(hour_angle)
-        hour_y = center.y() - hour_length * math.cos(hour_angle)
-        painter.drawLine(center, QPointF(hour_x, hour_y))
+        painter.drawLine(center, point(cx + hour_length * hour_z.imag, cy - hour_length * hour_z.real))
         
         # 绘制分针
-        painter.setPen(QPen(Qt.GlobalColor.blue, 4))
+        painter.setPen(pen(colors.blue, 4))
         minute_length = radius * 0.7
-        minute_x = center.x() + minute_length * math.sin(minute_angle)
-        minute_y = center.y() - minute_length * math.cos(minute_angle)
-        painter.drawLine(center, QPointF(minute_x, minute_y))
+        painter.drawLine(center, point(cx + minute_length * minute_z.imag, cy - minute_length * minute_z.real))
         
         # 绘制中心点
-        painter.setBrush(QBrush(Qt.GlobalColor.black))
+        painter.setBrush(QBrush(colors.black))
         painter.drawEllipse(center, 8, 8)
         
-        # 检查是否重合（角度差小于1度）
-        angle_diff = abs(hour_angle - minute_angle)
-        if angle_diff > math.pi:
-            angle_diff = 2 * math.pi - angle_diff
-        
-        if angle_diff < math.pi / 180:  # 小于1度认为重合
-            painter.setPen(QPen(Qt.GlobalColor.green, 8))
-            painter.setFont(QFont("Arial", 16, QFont.Weight.Bold))
-            painter.drawText(QPointF(center.x() - 50, center.y() + radius + 30), "指针重合!")
+        if self.show_coincidence:
+            painter.setPen(pen(colors.green, 8))
+            painter.setFont(_COINCIDE_FONT)
+            painter.drawText(point(cx - 50, cy + radius + 30), "指针重合!")
 
 class ClockSimulation(QMainWindow):
     def __init__(self):
@@ -107,6 +203,10 @@ class ClockSimulation(QMainWindow):
         self.stop_button.clicked.connect(self.stop_simulation)
         control_layout.addWidget(self.stop_button)
         
+        self.jump_button = QPushButton("跳到重合")
+        self.jump_button.clicked.connect(self.jump_to_result)
+        control_layout.addWidget(self.jump_button)
+        
         self.reset_button = QPushButton("重置")
         self.reset_button.clicked.connect(self.reset_simulation)
         control_layout.addWidget(self.reset_button)
@@ -136,6 +236,10 @@ class ClockSimulation(QMainWindow):
         
         layout.addLayout(info_layout)
         
+        # 标签上次显示的值
+        self._last_time_tuple = None
+        self._last_elapsed = None
+        
         # 创建定时器
         self.timer = QTimer()
         self.timer.timeout.connect(self.update_clock)
@@ -167,7 +271,10 @@ t = 180/5.5 = 360/11 ≈ 32.727分钟
         self.result_label.setText(f"理论计算结果: {result_minutes:.3f} 分钟 = 32分{result_seconds:.1f}秒")
     
     def start_simulation(self):
-        self.timer.start(100)  # 每100毫秒更新一次
+        # 记录起点，之后按真实经过时间插值指针位置
+        self._sim_start = time.monotonic()
+        self._sim_base = self.clock_widget.current_minutes
+        self.timer.start(_FRAME_MS)
         self.start_button.setEnabled(False)
         self.stop_button.setEnabled(True)
     
@@ -178,31 +285,63 @@ t = 180/5.5 = 360/11 ≈ 32.727分钟
     
     def reset_simulation(self):
         self.timer.stop()
-        self.clock_widget.current_minutes = 0
+        self.clock_widget.set_minutes(0)
+        self.update_coincidence()
         self.clock_widget.update()
         self.update_labels()
         self.start_button.setEnabled(True)
         self.stop_button.setEnabled(False)
     
-    def update_clock(self):
-        self.clock_widget.current_minutes += 0.1  # 每次增加0.1分钟
-        self.clock_widget.update()
+    def jump_to_result(self):
+        """不播放动画，直接跳到理论重合时刻"""
+        self.stop_simulation()
+        self.clock_widget.set_minutes(self.exact_result)
+        self.update_coincidence()
+        self.clock_widget.update_hands()
         self.update_labels()
+    
+    def update_clock(self):
+        # 按真实经过时间计算模拟分钟数，不再逐帧累加
+        elapsed = time.monotonic() - self._sim_start
+        target = self._sim_base + elapsed * _SIM_SPEED
+        
+        if target >= self.exact_result:
+            # 到达重合点，精确对齐后停止
+            self.clock_widget.set_minutes(self.exact_result)
+            self.stop_simulation()
+        else:
+            # 按整帧推进，掉帧时一次补足
+            steps = int((target - self.clock_widget.current_minutes) / _STEP_MINUTES)
+            if steps <= 0:
+                return
+            self.clock_widget.advance(steps)
         
-        # 检查是否接近重合点
-        if abs(self.clock_widget.current_minutes - self.exact_result) < 0.1:
-            self.timer.stop()
-            self.start_button.setEnabled(True)
-            self.stop_button.setEnabled(False)
+        self.update_coincidence()
+        self.clock_widget.update_hands()
+        self.update_labels()
+    
+    def update_coincidence(self):
+        """根据理论重合时刻设置重合提示，无需每帧比较指针角度"""
+        self.clock_widget.show_coincidence = (
+            abs(self.clock_widget.current_minutes - self.exact_result) < _COINCIDE_MINUTES)
     
     def update_labels(self):
-        total_minutes = 6 * 60 + self.clock_widget.current_minutes
+        current_minutes = self.clock_widget.current_minutes
+        total_minutes = 6 * 60 + current_minutes
         hours = int(total_minutes // 60)
         minutes = int(total_minutes % 60)
         seconds = int((total_minutes % 1) * 60)
         
-        self.time_label.setText(f"当前时间: {hours}:{minutes:02d}:{seconds:02d}")
-        self.elapsed_label.setText(f"经过时间: {self.clock_widget.current_minutes:.1f} 分钟")
+        # 只在显示内容变化时 setText，避免标签无谓地重新布局和重绘
+        time_tuple = (hours, minutes, seconds)
+        if time_tuple != self._last_time_tuple:
+            self._last_time_tuple = time_tuple
+            self.time_label.setText(f"当前时间: {hours}:{minutes:02d}:{seconds:02d}")
+        
+        elapsed = round(current_minutes, 1)
+        if elapsed != self._last_elapsed:
+            self._last_elapsed = elapsed
+            self.elapsed_label.setText(f"经过时间: {elapsed:.1f} 分钟")
 
 def main():
     app = QApplication(sys.argv)
@@ -7,43 +7,85 @@
 
 import os
 import sys
+import mmap
+import heapq
 import argparse
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+# 读取文件时每次读取的字节数
+_CHUNK_SIZE = 1 << 20
+
+# 超过此大小的文件改用 mmap 统计，每次扫描一个窗口
+_MMAP_THRESHOLD = 1 << 20
+_MMAP_WINDOW = 16 << 20
+
+# 视为文本文件的扩展名，元组形式供 str.endswith 一次匹配
+_TEXT_EXTENSIONS = (
+    '.py', '.txt', '.md', '.json', '.xml', '.html', '.htm', '.css', '.js',
+    '.java', '.cpp', '.c', '.h', '.hpp', '.cs', '.php', '.rb', '.go',
+    '.rs', '.swift', '.kt', '.scala', '.sql', '.sh', '.bat', '.ps1',
+    '.yaml', '.yml', '.toml', '.ini', '.cfg', '.conf', '.log',
+    '.csv', '.tsv', '.tex', '.r', '.m', '.pl', '.lua', '.vim'
+)
+
+def _count_newlines_mmap(f, size):
+    """把大文件映射到内存后按窗口统计换行符，返回(换行数, 最后一个字节)"""
+    lines = 0
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for start in range(0, size, _MMAP_WINDOW):
+            lines += mm[start:start + _MMAP_WINDOW].count(b'\n')
+        last_byte = mm[size - 1:size]
+    return lines, last_byte
+
 def count_lines_in_file(file_path):
     """统计单个文件的行数"""
+    # 按字节块统计换行符，无需解码，也不为每一行创建字符串
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return len(f.readlines())
-    except UnicodeDecodeError:
-        # 尝试其他编码
-        try:
-            with open(file_path, 'r', encoding='gbk') as f:
-                return len(f.readlines())
-        except:
-            try:
-                with open(file_path, 'r', encoding='latin-1') as f:
-                    return len(f.readlines())
-            except:
-                return 0
-    except Exception as e:
+        lines = 0
+        last_byte = b'\n'
+        with open(file_path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size > _MMAP_THRESHOLD:
+                lines, last_byte = _count_newlines_mmap(f, size)
+            else:
+                buf = f.read(_CHUNK_SIZE)
+                while buf:
+                    lines += buf.count(b'\n')
+                    last_byte = buf[-1:]
+                    buf = f.read(_CHUNK_SIZE)
+        # 最后一行没有换行符时也算一行
+        if last_byte != b'\n':
+            lines += 1
+        return lines
+    except (OSError, ValueError) as e:
         print(f"⚠️ 无法读取文件 {file_path}: {e}")
         return 0
 
-def is_text_file(file_path):
-    """判断是否为文本文件"""
-    text_extensions = {
-        '.py', '.txt', '.md', '.json', '.xml', '.html', '.htm', '.css', '.js',
-        '.java', '.cpp', '.c', '.h', '.hpp', '.cs', '.php', '.rb', '.go',
-        '.rs', '.swift', '.kt', '.scala', '.sql', '.sh', '.bat', '.ps1',
-        '.yaml', '.yml', '.toml', '.ini', '.cfg', '.conf', '.log',
-        '.csv', '.tsv', '.tex', '.r', '.m', '.pl', '.lua', '.vim'
-    }
-    
-    return file_path.suffix.lower() in text_extensions
+def is_text_file(name):
+    """按扩展名判断是否为文本文件"""
+    return name.lower().endswith(_TEXT_EXTENSIONS)
+
+def iter_text_files(directory, recursive=True):
+    """遍历目录，逐个返回文本文件的路径字符串"""
+    # os.scandir 的 DirEntry 缓存了文件类型，省去逐个 stat 和 Path 对象的开销
+    stack = [os.fspath(directory)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if recursive:
+                            stack.append(entry.path)
+                    elif entry.is_file():
+                        if is_text_file(entry.name):
+                            yield entry.path
+        except OSError as e:
+            print(f"⚠️ 无法读取目录: {e}")
 
-def count_lines_in_directory(directory_path='.', recursive=True):
-    """统计目录下所有文件的行数"""
+def count_lines_in_directory(directory_path='.', recursive=True, top=None):
+    """统计目录下所有文件的行数，top 为 None 时列出全部文件，否则只列出行数最多的 top 个"""
     directory = Path(directory_path)
     
     # 检查目录是否存在
@@ -57,36 +99,55 @@ def count_lines_in_directory(directory_path='.', recursive=True):
     
     total_lines = 0
     file_count = 0
-    results = []
     
     print(f"📁 正在统计目录: {directory.absolute()}")
     print(f"🔍 递归搜索: {'是' if recursive else '否'}")
     print("=" * 60)
     
-    # 遍历目录下的所有文件
-    if recursive:
-        file_iterator = directory.rglob('*')
-    else:
-        file_iterator = directory.glob('*')
-    
-    for file_path in file_iterator:
-        if file_path.is_file() and is_text_file(file_path):
-            lines = count_lines_in_file(file_path)
+    def line_counts():
+        """边遍历边提交统计任务，按遍历顺序逐个产出(路径, 行数)"""
+        # 同时在途的文件数有上限，目录再大也不会一次把所有路径和任务放进内存
+        pending = deque()
+        for file_path in iter_text_files(directory, recursive):
+            pending.append((file_path, executor.submit(count_lines_in_file, file_path)))
+            if len(pending) >= max_workers * 4:
+                file_path, future = pending.popleft()
+                yield file_path, future.result()
+        for file_path, future in pending:
+            yield file_path, future.result()
+    
+    def counted_files():
+        """边统计边累加总数，逐个产出(行数, 路径)"""
+        nonlocal total_lines, file_count
+        for file_path, lines in line_counts():
             if lines > 0:
-                relative_path = file_path.relative_to(directory)
-                results.append((str(relative_path), lines))
                 total_lines += lines
                 file_count += 1
+                yield lines, file_path
+    
+    # 读取文件时会释放GIL，用线程池让多个文件的磁盘I/O重叠进行
+    max_workers = min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # 按行数排序（从多到少）；只需前 top 个时用堆，内存只保留 top 条
+        if top is None:
+            ranked = sorted(counted_files(), key=lambda x: x[0], reverse=True)
+        else:
+            ranked = heapq.nlargest(top, counted_files(), key=lambda x: x[0])
     
-    # 按行数排序（从多到少）
-    results.sort(key=lambda x: x[1], reverse=True)
+    # 只为最终要显示的文件计算相对路径
+    results = [(os.path.relpath(file_path, directory), lines) for lines, file_path in ranked]
     
     # 显示结果
     print(f"{'文件名':<50} {'行数':>8}")
     print("-" * 60)
     
-    for file_name, lines in results:
-        print(f"{file_name:<50} {lines:>8}")
+    # 一次性写出所有行，避免每个文件一次 print
+    if results:
+        sys.stdout.write('\n'.join(f"{file_name:<50} {lines:>8}" for file_name, lines in results))
+        sys.stdout.write('\n')
+    
+    if top is not None and file_count > top:
+        print(f"... 仅显示行数最多的 {top} 个文件")
     
     print("=" * 60)
     print(f"📊 统计结果:")
@@ -96,6 +157,16 @@ def count_lines_in_directory(directory_path='.', recursive=True):
     
     return total_lines, file_count
 
+def _positive_int(value):
+    """argparse类型：正整数"""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"不是整数: {value}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"必须是正整数: {value}")
+    return number
+
 def parse_arguments():
     """解析命令行参数"""
     parser = argparse.ArgumentParser(
@@ -107,6 +178,7 @@ def parse_arguments():
   python count_lines.py /path/to/project   # 统计指定目录
   python count_lines.py . --no-recursive   # 只统计当前目录，不递归子目录
   python count_lines.py ../src -r          # 统计上级目录的src文件夹（递归）
+  python count_lines.py . --top 20         # 只列出行数最多的20个文件
         """
     )
     
@@ -131,6 +203,13 @@ def parse_arguments():
         help='不递归搜索子目录'
     )
     
+    parser.add_argument(
+        '-t', '--top',
+        type=_positive_int,
+        default=None,
+        help='只列出行数最多的前N个文件（默认全部列出，总数仍按全部文件统计）'
+    )
+    
     return parser.parse_args()
 
 def main():
@@ -142,7 +221,7 @@ def main():
     print("=" * 60)
     
     try:
-        total_lines, file_count = count_lines_in_directory(args.directory, args.recursive)
+        total_lines, file_count = count_lines_in_directory(args.directory, args.recursive, args.top)
         
         if file_count == 0:
             print("❌ 指定目录下没有找到可统计的文本文件")
@@ -1,29 +1,32 @@
+import os
 import sys
 import sqlite3
 import json
 import hashlib
-from datetime import datetime, timedelta, date
+import hmac
+from datetime import date
 from PyQt6.QtWidgets import *
 from PyQt6.QtCore import *
 from PyQt6.QtGui import *
 import threading
+import queue
+import time
 import random
+from contextlib import contextmanager
+from functools import cached_property, lru_cache
 
 class TTSEngine:
     """文本转语音引擎"""
+    # 扫描到的英语语音ID，所有实例共用
+    _english_voice_id = None
+    _voice_scanned = False
+    
     def __init__(self):
         self.enabled = True
-        self._lock = None
-        self._speaking = False
-        self.init_lock()
-    
-    def init_lock(self):
-        """初始化线程锁"""
-        try:
-            import threading
-            self._lock = threading.Lock()
-        except Exception as e:
-            print(f"⚠️ 线程锁初始化失败: {e}")
+        self._engine = None  # 持久的pyttsx3引擎，由播放线程在首次播放时创建
+        # 单个常驻播放线程从队列中取出待播放的文本，队列只保留最新的一条
+        self._queue = queue.Queue(maxsize=1)
+        threading.Thread(target=self._worker, daemon=True).start()
     
     def create_engine(self):
         """创建新的TTS引擎实例"""
@@ -31,13 +34,16 @@ class TTSEngine:
             import pyttsx3
             engine = pyttsx3.init()
             
-            # 设置语音属性
-            voices = engine.getProperty('voices')
-            # 尝试设置英语语音
-            for voice in voices:
-                if 'english' in voice.name.lower() or 'en' in voice.id.lower():
-                    engine.setProperty('voice', voice.id)
-                    break
+            # 尝试设置英语语音，语音列表只在第一次创建引擎时扫描
+            cls = type(self)
+            if not cls._voice_scanned:
+                cls._english_voice_id = next(
+                    (voice.id for voice in engine.getProperty('voices')
+                     if 'english' in voice.name.lower() or 'en' in voice.id.lower()),
+                    None)
+                cls._voice_scanned = True
+            if cls._english_voice_id is not None:
+                engine.setProperty('voice', cls._english_voice_id)
             
             # 设置语速和音量
             engine.setProperty('rate', 150)  # 语速
@@ -48,6 +54,12 @@ class TTSEngine:
             print(f"⚠️ TTS引擎创建失败: {e}")
             return None
     
+    def get_engine(self):
+        """获取持久的TTS引擎，不存在时创建"""
+        if self._engine is None:
+            self._engine = self.create_engine()
+        return self._engine
+    
     def cleanup_engine(self, engine):
         """清理TTS引擎资源"""
         try:
@@ -58,52 +70,35 @@ class TTSEngine:
         except Exception as e:
             print(f"⚠️ TTS引擎清理失败: {e}")
     
+    def _worker(self):
+        """播放线程 - 依次播放队列中的文本，引擎只在本线程中创建和使用"""
+        while True:
+            text = self._queue.get()
+            try:
+                engine = self.get_engine()
+                if not engine:
+                    continue
+                
+                # 播放语音
+                engine.say(text)
+                engine.runAndWait()
+                print(f"🔊 播放发音: {text}")
+                
+            except Exception as e:
+                print(f"⚠️ 语音播放失败: {e}")
+                # 引擎出错后丢弃，下次播放时重新创建
+                self.cleanup_engine(self._engine)
+                self._engine = None
+    
     def speak(self, text):
-        """播放语音 - 每次都创建新的引擎实例"""
+        """播放语音 - 放入播放队列后立即返回，替换掉尚未开始播放的旧文本"""
         if not self.enabled or not text:
             return
-            
-        # 防止重复播放
-        if self._speaking:
-            return
-            
         try:
-            import threading
-            
-            def speak_thread():
-                engine = None
-                try:
-                    with self._lock:
-                        if self._speaking:  # 双重检查
-                            return
-                        self._speaking = True
-                    
-                    # 创建新的引擎实例
-                    engine = self.create_engine()
-                    if not engine:
-                        return
-                    
-                    # 播放语音
-                    engine.say(text)
-                    engine.runAndWait()
-                    print(f"🔊 播放发音: {text}")
-                    
-                except Exception as e:
-                    print(f"⚠️ 语音播放失败: {e}")
-                finally:
-                    # 清理引擎资源
-                    self.cleanup_engine(engine)
-                    # 重置状态
-                    with self._lock:
-                        self._speaking = False
-            
-            thread = threading.Thread(target=speak_thread, daemon=True)
-            thread.start()
-            
-        except Exception as e:
-            print(f"⚠️ 语音播放失败: {e}")
-            with self._lock:
-                self._speaking = False
+            self._queue.get_nowait()
+        except queue.Empty:
+            pass
+        self._queue.put_nowait(text)
     
     def is_available(self):
         """检查TTS是否可用"""
@@ -118,103 +113,348 @@ class TTSEngine:
             pass
         return False
 
+# 默认单词库文件 - 按教育阶段分级，每项为[单词, 音标, 释义, 级别]，只在首次建库时读取
+_DEFAULT_WORDS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'default_words.json')
+
+def _configure_connection(conn, read_only=False):
+    """为新连接设置一次性的PRAGMA：WAL日志、降低同步级别、加大缓存；read_only的连接禁止写入"""
+    cursor = conn.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    journal_mode = cursor.fetchone()[0]
+    if journal_mode.lower() != "wal":
+        print(f"⚠️ 数据库未能启用WAL模式，当前为: {journal_mode}")
+    
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA cache_size=-20000")
+    # 通过内存映射读取数据库文件，只读的单词表页面直接由操作系统页缓存提供
+    cursor.execute("PRAGMA mmap_size=67108864")
+    cursor.execute("PRAGMA busy_timeout=5000")
+    cursor.execute("PRAGMA foreign_keys=ON")
+    if read_only:
+        cursor.execute("PRAGMA query_only=ON")
+
+# 密码哈希的PBKDF2迭代次数
+_PBKDF2_ITERATIONS = 200_000
+
+# 数据库结构版本，保存在 PRAGMA user_version 中，升级表结构时递增
+_SCHEMA_VERSION = 1
+
+# 数据库结构，用一次executescript在单个事务内创建所有表
+_SCHEMA_SQL = '''
+    BEGIN;
+    
+    -- 用户表
+    CREATE TABLE IF NOT EXISTS users (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        username TEXT UNIQUE NOT NULL,
+        password_hash TEXT NOT NULL,
+        email TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        last_login TIMESTAMP,
+        salt BLOB
+    );
+    
+    -- 单词表
+    CREATE TABLE IF NOT EXISTS words (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        word TEXT NOT NULL,
+        pronunciation TEXT,
+        meaning TEXT NOT NULL,
+        level TEXT DEFAULT '初级',
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    
+    -- 用户单词学习记录表
+    CREATE TABLE IF NOT EXISTS user_word_progress (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        word_id INTEGER NOT NULL,
+        review_count INTEGER DEFAULT 0,
+        correct_count INTEGER DEFAULT 0,
+        difficulty INTEGER DEFAULT 1,
+        last_review_date INTEGER,
+        next_review_date INTEGER,
+        mastery_level INTEGER DEFAULT 0,
+        consecutive_correct INTEGER DEFAULT 0,
+        FOREIGN KEY (user_id) REFERENCES users (id),
+        FOREIGN KEY (word_id) REFERENCES words (id),
+        UNIQUE(user_id, word_id)
+    );
+    
+    -- 学习记录表
+    CREATE TABLE IF NOT EXISTS study_records (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        word_id INTEGER NOT NULL,
+        study_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        is_correct BOOLEAN NOT NULL,
+        study_mode TEXT NOT NULL,
+        response_time REAL,
+        FOREIGN KEY (user_id) REFERENCES users (id),
+        FOREIGN KEY (word_id) REFERENCES words (id)
+    );
+    
+    -- 用户设置表
+    CREATE TABLE IF NOT EXISTS user_settings (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        setting_key TEXT NOT NULL,
+        setting_value TEXT NOT NULL,
+        FOREIGN KEY (user_id) REFERENCES users (id),
+        UNIQUE(user_id, setting_key)
+    );
+    
+    -- 系统状态表 - 新增
+    CREATE TABLE IF NOT EXISTS system_state (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        state_key TEXT NOT NULL,
+        state_value TEXT NOT NULL,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (user_id) REFERENCES users (id),
+        UNIQUE(user_id, state_key)
+    );
+    
+    COMMIT;
+'''
+
+# 获取用户需要复习的单词，排除已经连续三次正确的单词
+# 每个用户的每个单词都预先有一条进度记录，按 idx_uwp_user_next 索引顺序读取，无需排序
+_SQL_REVIEW_BASE = '''
+    SELECT w.id, w.word, w.pronunciation, w.meaning, w.level,
+           uwp.review_count, uwp.correct_count, uwp.difficulty,
+           uwp.mastery_level, uwp.consecutive_correct
+    FROM user_word_progress uwp
+    JOIN words w ON w.id = uwp.word_id
+    WHERE uwp.user_id = ? AND uwp.next_review_date <= ?
+    AND uwp.consecutive_correct < 3
+'''
+_SQL_REVIEW_ORDER = ' ORDER BY uwp.next_review_date ASC LIMIT ?'
+_SQL_REVIEW_ALL = _SQL_REVIEW_BASE + _SQL_REVIEW_ORDER
+_SQL_REVIEW_BY_LEVEL = _SQL_REVIEW_BASE + ' AND w.level = ?' + _SQL_REVIEW_ORDER
+
+# 为用户补齐尚未学习的单词的进度记录，首次复习时间为单词的加入时间
+_SQL_INIT_PROGRESS = '''
+    INSERT OR IGNORE INTO user_word_progress (user_id, word_id, next_review_date)
+    SELECT u.id, w.id, CAST(strftime('%s', w.created_at) AS INTEGER)
+    FROM users u CROSS JOIN words w
+'''
+_SQL_INIT_USER_PROGRESS = _SQL_INIT_PROGRESS + ' WHERE u.id = ?'
+
+# 重置学习进度：删除用户的学习记录和进度，之后用 _SQL_INIT_USER_PROGRESS 补齐初始进度
+_SQL_DELETE_USER_RECORDS = 'DELETE FROM study_records WHERE user_id = ?'
+_SQL_DELETE_USER_PROGRESS = 'DELETE FROM user_word_progress WHERE user_id = ?'
+
+# 复习时间以整数Unix时间戳(秒)保存
+_MINUTE = 60
+_HOUR = 60 * _MINUTE
+_DAY = 24 * _HOUR
+
+# 复习间隔查找表：答对时按掌握程度(0-5)取值，答错时按难度(0-5)取值，连续三次正确后一年后再复习
+_NEXT_REVIEW_OK = (20 * _MINUTE, 20 * _MINUTE, _HOUR, 8 * _HOUR, _DAY, 2 * _DAY)
+_NEXT_REVIEW_FAIL = (15 * _MINUTE, 15 * _MINUTE, 15 * _MINUTE, 10 * _MINUTE, 5 * _MINUTE, 5 * _MINUTE)
+_MASTERED_REVIEW = 365 * _DAY
+
+# 学习进度后台写入：攒够这么多条或等待这么久后合并为一个事务提交
+_WRITE_BATCH_SIZE = 50
+_WRITE_BATCH_SECONDS = 0.5
+# 数据库被其他连接锁住导致提交失败时，等待这么久后重试一次
+_WRITE_RETRY_SECONDS = 1.0
+
+_SQL_SAVE_PROGRESS = '''
+    INSERT OR REPLACE INTO user_word_progress 
+    (user_id, word_id, review_count, correct_count, difficulty, 
+     last_review_date, next_review_date, mastery_level, consecutive_correct)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+_SQL_ADD_STUDY_RECORD = '''
+    INSERT INTO study_records 
+    (user_id, word_id, is_correct, study_mode)
+    VALUES (?, ?, ?, ?)
+'''
+
+class _DatabaseSignals(QObject):
+    """数据库的信号，在后台写入线程中发出，由界面线程接收"""
+    write_failed = pyqtSignal(str)  # 错误信息
+
 class UserDatabase:
     """用户数据库管理"""
     def __init__(self, db_path="word_memory_users.db"):
         self.db_path = db_path
         self.current_user_id = None
+        
+        # 所有方法共用一个长连接，页缓存保持热态，避免每次调用重新打开数据库
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None,
+                                     cached_statements=256)
+        _configure_connection(self._conn)
+        
+        # 只读连接池：WAL模式下读取不必等待共享连接上的写入，后台线程（如单词预取）也可以并发读取。
+        # 连接用完后放回池中，在线程之间传递，因此关闭线程检查
+        self._read_pool = queue.LifoQueue()
+        self._read_conns = []
+        
+        # 学习进度的内存副本 {(user_id, word_id): (review_count, correct_count, difficulty,
+        # mastery_level, consecutive_correct)}，以及把写入合并提交的后台线程
+        self._progress_cache = {}
+        self.signals = _DatabaseSignals()
+        self._write_queue = queue.Queue()
+        self._writer_thread = threading.Thread(target=self._writer, daemon=True)
+        self._writer_thread.start()
+        self._closed = False  # close() 开始后为True，写入线程不再处理刷新请求
+        
+        # 统计结果缓存 {user_id: (统计日期, 统计结果)}，进度变化的用户记入 _stats_dirty
+        self._stats_cache = {}
+        self._stats_dirty = set()
+        
         self.init_database()
     
-    def init_database(self):
-        """初始化数据库"""
-        conn = sqlite3.connect(self.db_path)
+    @contextmanager
+    def _cursor(self):
+        """获取共享连接上的游标，期间持有连接锁"""
+        with self._lock:
+            yield self._conn.cursor()
+    
+    @contextmanager
+    def _read_cursor(self):
+        """从只读连接池取一个连接的游标，用完后放回；池中没有空闲连接时新建"""
+        try:
+            conn = self._read_pool.get_nowait()
+        except queue.Empty:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None,
+                                   cached_statements=256)
+            _configure_connection(conn, read_only=True)
+            with self._lock:
+                self._read_conns.append(conn)
         cursor = conn.cursor()
+        try:
+            yield cursor
+        finally:
+            # 关闭游标结束读事务，连接放回池中时不再持有旧快照
+            cursor.close()
+            self._read_pool.put(conn)
+    
+    @contextmanager
+    def _transaction(self):
+        """在共享连接上执行一个显式事务，出错时回滚；开始时即取得写锁"""
+        with self._lock:
+            cursor = self._conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                yield cursor
+                cursor.execute("COMMIT")
+            except BaseException:
+                # COMMIT失败时事务仍然打开，同样需要回滚，连接才能开始下一个事务
+                if self._conn.in_transaction:
+                    cursor.execute("ROLLBACK")
+                raise
+    
+    def close(self):
+        """写入所有待提交的进度后关闭数据库连接，重复调用时什么也不做"""
+        if self._closed:
+            return
+        self._closed = True
+        self._write_queue.put(None)
+        self._writer_thread.join()
+        with self._lock:
+            for conn in self._read_conns:
+                conn.close()
+            self._conn.close()
+    
+    def _writer(self):
+        """后台写入线程 - 把排队的进度更新按批次放进一个事务提交"""
+        running = True
+        while running:
+            batch = [self._write_queue.get()]
+            deadline = time.monotonic() + _WRITE_BATCH_SECONDS
+            # 遇到刷新请求(Event)或关闭标记(None)时立即提交
+            while len(batch) < _WRITE_BATCH_SIZE and isinstance(batch[-1], tuple):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._write_queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            
+            updates = [item for item in batch if isinstance(item, tuple)]
+            if updates:
+                self._commit_updates(updates)
+            
+            for item in batch:
+                if item is None:
+                    running = False
+                elif isinstance(item, threading.Event):
+                    item.set()
+    
+    def _commit_updates(self, updates):
+        """在一个事务中提交一批进度更新和学习记录；数据库被锁住时稍等后重试一次"""
+        for retry in (True, False):
+            try:
+                with self._transaction() as cursor:
+                    cursor.executemany(_SQL_SAVE_PROGRESS, [progress for progress, record in updates])
+                    cursor.executemany(_SQL_ADD_STUDY_RECORD, [record for progress, record in updates])
+                return
+            except sqlite3.OperationalError as e:
+                if retry and "locked" in str(e):
+                    time.sleep(_WRITE_RETRY_SECONDS)
+                    continue
+                error = e
+            except sqlite3.Error as e:
+                error = e
+            break
+        
+        print(f"⚠️ 学习进度写入失败: {error}")
+        # 这批进度没有落盘，丢弃对应的内存副本，下次从数据库重新读取
+        for progress, record in updates:
+            user_id, word_id = progress[0], progress[1]
+            self._progress_cache.pop((user_id, word_id), None)
+            self._stats_dirty.add(user_id)
+        self.signals.write_failed.emit(str(error))
+    
+    def flush(self, wait=True):
+        """让后台线程立即提交所有排队的进度更新，wait为True时等待提交完成"""
+        # 关闭后写入线程已经退出，刷新请求不会再有人处理
+        if self._closed:
+            return
+        done = threading.Event()
+        self._write_queue.put(done)
+        if wait:
+            done.wait()
+    
+    def clear_progress_cache(self):
+        """丢弃学习进度和统计结果的内存副本，数据库中的进度被直接修改后调用"""
+        self._progress_cache.clear()
+        self._stats_cache.clear()
+    
+    def reset_user_progress(self):
+        """重置当前用户的学习进度，在共享连接上执行"""
+        if not self.current_user_id:
+            return False
         
-        # 用户表
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                username TEXT UNIQUE NOT NULL,
-                password_hash TEXT NOT NULL,
-                email TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                last_login TIMESTAMP
-            )
-        ''')
-        
-        # 单词表
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS words (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                word TEXT NOT NULL,
-                pronunciation TEXT,
-                meaning TEXT NOT NULL,
-                level TEXT DEFAULT '初级',
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # 用户单词学习记录表
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS user_word_progress (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                word_id INTEGER NOT NULL,
-                review_count INTEGER DEFAULT 0,
-                correct_count INTEGER DEFAULT 0,
-                difficulty INTEGER DEFAULT 1,
-                last_review_date TIMESTAMP,
-                next_review_date TIMESTAMP,
-                mastery_level INTEGER DEFAULT 0,
-                consecutive_correct INTEGER DEFAULT 0,
-                FOREIGN KEY (user_id) REFERENCES users (id),
-                FOREIGN KEY (word_id) REFERENCES words (id),
-                UNIQUE(user_id, word_id)
-            )
-        ''')
-        
-        # 学习记录表
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS study_records (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                word_id INTEGER NOT NULL,
-                study_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                is_correct BOOLEAN NOT NULL,
-                study_mode TEXT NOT NULL,
-                response_time REAL,
-                FOREIGN KEY (user_id) REFERENCES users (id),
-                FOREIGN KEY (word_id) REFERENCES words (id)
-            )
-        ''')
-        
-        # 用户设置表
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS user_settings (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                setting_key TEXT NOT NULL,
-                setting_value TEXT NOT NULL,
-                FOREIGN KEY (user_id) REFERENCES users (id),
-                UNIQUE(user_id, setting_key)
-            )
-        ''')
-        
-        # 系统状态表 - 新增
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS system_state (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id INTEGER NOT NULL,
-                state_key TEXT NOT NULL,
-                state_value TEXT NOT NULL,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (user_id) REFERENCES users (id),
-                UNIQUE(user_id, state_key)
-            )
-        ''')
-        
-        conn.commit()
-        conn.close()
+        user_id = self.current_user_id
+        # 先提交排队的进度，避免删除后又被写回
+        self.flush()
+        # 删除和补齐初始进度放在同一个事务里，只提交一次
+        with self._transaction() as cursor:
+            # 清空当前用户的学习记录
+            cursor.execute(_SQL_DELETE_USER_RECORDS, (user_id,))
+            cursor.execute(_SQL_DELETE_USER_PROGRESS, (user_id,))
+            cursor.execute(_SQL_INIT_USER_PROGRESS, (user_id,))
+        
+        self.clear_progress_cache()
+        return True
+    
+    def init_database(self):
+        """初始化数据库"""
+        with self._lock:
+            try:
+                self._conn.executescript(_SCHEMA_SQL)
+            except sqlite3.Error:
+                if self._conn.in_transaction:
+                    self._conn.execute("ROLLBACK")
+                raise
         
         # 执行数据库迁移
         self.migrate_database()
@@ -224,374 +464,237 @@ class UserDatabase:
         
         # 初始化admin用户
         self.init_admin_user()
+        
+        # 索引和查询规划器的统计信息由 finish_init 在界面显示后建立
+    
+    def finish_init(self):
+        """启动后可以延后的初始化：创建索引并更新统计信息（ANALYZE），在主窗口显示后调用"""
+        self.create_indexes()
+    
+    def create_indexes(self):
+        """为复习查询、统计和按级别筛选建立索引"""
+        # (user_id, word_id) 已由 user_word_progress 的 UNIQUE 约束自动建立索引
+        with self._cursor() as cursor:
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_uwp_user_next
+                ON user_word_progress(user_id, next_review_date, consecutive_correct)
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_sr_user_date
+                ON study_records(user_id, study_date)
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_words_level
+                ON words(level)
+            ''')
+            cursor.execute("ANALYZE")
     
     def migrate_database(self):
-        """数据库迁移 - 添加新字段"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        """数据库迁移 - 添加新字段，完成后记入 PRAGMA user_version，以后启动不再检查"""
+        with self._cursor() as cursor:
+            cursor.execute("PRAGMA user_version")
+            if cursor.fetchone()[0] >= _SCHEMA_VERSION:
+                return
         
         try:
-            # 检查consecutive_correct字段是否存在
-            cursor.execute("PRAGMA table_info(user_word_progress)")
-            columns = [column[1] for column in cursor.fetchall()]
-            
-            if 'consecutive_correct' not in columns:
+            with self._transaction() as cursor:
+                # 检查consecutive_correct字段是否存在
+                cursor.execute("PRAGMA table_info(user_word_progress)")
+                columns = [column[1] for column in cursor.fetchall()]
+                
+                if 'consecutive_correct' not in columns:
+                    cursor.execute('''
+                        ALTER TABLE user_word_progress 
+                        ADD COLUMN consecutive_correct INTEGER DEFAULT 0
+                    ''')
+                    print("✅ 数据库已升级：添加连续正确次数字段")
+                
+                # 检查密码盐字段是否存在
+                cursor.execute("PRAGMA table_info(users)")
+                columns = [column[1] for column in cursor.fetchall()]
+                
+                if 'salt' not in columns:
+                    cursor.execute("ALTER TABLE users ADD COLUMN salt BLOB")
+                    print("✅ 数据库已升级：添加密码盐字段")
+                
+                # 旧版本以本地时间文本保存复习时间，转换为整数Unix时间戳
+                converted = 0
+                for column in ('last_review_date', 'next_review_date'):
+                    cursor.execute(f'''
+                        UPDATE user_word_progress 
+                        SET {column} = CAST(strftime('%s', {column}, 'utc') AS INTEGER)
+                        WHERE typeof({column}) = 'text'
+                    ''')
+                    converted += cursor.rowcount
+                if converted:
+                    print("✅ 数据库已升级：复习时间改为整数时间戳")
+                
+                # 旧版本只在学习后才创建进度记录，为所有用户补齐
                 cursor.execute('''
-                    ALTER TABLE user_word_progress 
-                    ADD COLUMN consecutive_correct INTEGER DEFAULT 0
+                    SELECT (SELECT COUNT(*) FROM users) * (SELECT COUNT(*) FROM words)
+                           > (SELECT COUNT(*) FROM user_word_progress)
                 ''')
-                print("✅ 数据库已升级：添加连续正确次数字段")
+                if cursor.fetchone()[0]:
+                    cursor.execute(_SQL_INIT_PROGRESS)
+                    print("✅ 数据库已升级：补齐单词进度记录")
                 
+                cursor.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
         except sqlite3.Error as e:
             print(f"⚠️ 数据库迁移警告: {e}")
-        
-        conn.commit()
-        conn.close()
     
     def init_admin_user(self):
         """初始化admin用户"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # 检查是否已有admin用户
-        cursor.execute("SELECT id FROM users WHERE username = 'admin'")
-        if cursor.fetchone():
-            conn.close()
-            return
-        
-        # 创建admin用户
-        password_hash = self.hash_password("admin123")
-        cursor.execute('''
-            INSERT INTO users (username, password_hash, email)
-            VALUES (?, ?, ?)
-        ''', ("admin", password_hash, "admin@wordmemory.com"))
+        with self._transaction() as cursor:
+            # 检查是否已有admin用户
+            cursor.execute("SELECT id FROM users WHERE username = 'admin'")
+            if cursor.fetchone():
+                return
+            
+            # 创建admin用户
+            salt = os.urandom(16)
+            password_hash = self.hash_password("admin123", salt)
+            cursor.execute('''
+                INSERT INTO users (username, password_hash, email, salt)
+                VALUES (?, ?, ?, ?)
+            ''', ("admin", password_hash, "admin@wordmemory.com", salt))
+            cursor.execute(_SQL_INIT_USER_PROGRESS, (cursor.lastrowid,))
         
-        conn.commit()
-        conn.close()
         print("✅ Admin用户已创建 - 用户名: admin, 密码: admin123")
-        
-        # 初始化默认单词库
-        self.init_default_words()
-        
-        # 初始化admin用户
-        self.init_admin_user()
     
     def init_default_words(self):
         """初始化默认单词库"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._cursor() as cursor:
+            # 检查是否已有单词
+            cursor.execute("SELECT COUNT(*) FROM words")
+            if cursor.fetchone()[0] > 0:
+                return
         
-        # 检查是否已有单词
-        cursor.execute("SELECT COUNT(*) FROM words")
-        if cursor.fetchone()[0] > 0:
-            conn.close()
+        try:
+            with open(_DEFAULT_WORDS_PATH, encoding='utf-8') as f:
+                default_words = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ 默认单词库加载失败: {e}")
             return
         
-        # 默认单词库 - 按教育阶段分级
-        default_words = [
-            # 小学词汇 (基础生活词汇)
-            ("cat", "/kæt/", "猫", "小学"),
-            ("dog", "/dɔːɡ/", "狗", "小学"),
-            ("book", "/bʊk/", "书", "小学"),
-            ("pen", "/pen/", "钢笔", "小学"),
-            ("apple", "/ˈæpl/", "苹果", "小学"),
-            ("water", "/ˈwɔːtər/", "水", "小学"),
-            ("food", "/fuːd/", "食物", "小学"),
-            ("house", "/haʊs/", "房子", "小学"),
-            ("car", "/kɑːr/", "汽车", "小学"),
-            ("tree", "/triː/", "树", "小学"),
-            ("sun", "/sʌn/", "太阳", "小学"),
-            ("moon", "/muːn/", "月亮", "小学"),
-            ("star", "/stɑːr/", "星星", "小学"),
-            ("red", "/red/", "红色", "小学"),
-            ("blue", "/bluː/", "蓝色", "小学"),
-            ("green", "/ɡriːn/", "绿色", "小学"),
-            ("big", "/bɪɡ/", "大的", "小学"),
-            ("small", "/smɔːl/", "小的", "小学"),
-            ("good", "/ɡʊd/", "好的", "小学"),
-            ("bad", "/bæd/", "坏的", "小学"),
-            ("happy", "/ˈhæpi/", "快乐的", "小学"),
-            ("sad", "/sæd/", "悲伤的", "小学"),
-            ("run", "/rʌn/", "跑", "小学"),
-            ("walk", "/wɔːk/", "走", "小学"),
-            ("eat", "/iːt/", "吃", "小学"),
-            ("drink", "/drɪŋk/", "喝", "小学"),
-            ("sleep", "/sliːp/", "睡觉", "小学"),
-            ("play", "/pleɪ/", "玩", "小学"),
-            ("work", "/wɜːrk/", "工作", "小学"),
-            ("love", "/lʌv/", "爱", "小学"),
-            ("family", "/ˈfæməli/", "家庭", "小学"),
-            ("friend", "/frend/", "朋友", "小学"),
-            ("mother", "/ˈmʌðər/", "母亲", "小学"),
-            ("father", "/ˈfɑːðər/", "父亲", "小学"),
-            ("brother", "/ˈbrʌðər/", "兄弟", "小学"),
-            ("sister", "/ˈsɪstər/", "姐妹", "小学"),
-            ("boy", "/bɔɪ/", "男孩", "小学"),
-            ("girl", "/ɡɜːrl/", "女孩", "小学"),
-            ("man", "/mæn/", "男人", "小学"),
-            ("woman", "/ˈwʊmən/", "女人", "小学"),
-            
-            # 初中词汇 (学科和日常扩展词汇)
-            ("computer", "/kəmˈpjuːtər/", "电脑", "初中"),
-            ("internet", "/ˈɪntərnet/", "互联网", "初中"),
-            ("telephone", "/ˈteləfoʊn/", "电话", "初中"),
-            ("television", "/ˈteləvɪʒn/", "电视", "初中"),
-            ("music", "/ˈmjuːzɪk/", "音乐", "初中"),
-            ("movie", "/ˈmuːvi/", "电影", "初中"),
-            ("sport", "/spɔːrt/", "运动", "初中"),
-            ("football", "/ˈfʊtbɔːl/", "足球", "初中"),
-            ("basketball", "/ˈbæskɪtbɔːl/", "篮球", "初中"),
-            ("swimming", "/ˈswɪmɪŋ/", "游泳", "初中"),
-            ("science", "/ˈsaɪəns/", "科学", "初中"),
-            ("mathematics", "/ˌmæθəˈmætɪks/", "数学", "初中"),
-            ("history", "/ˈhɪstəri/", "历史", "初中"),
-            ("geography", "/dʒiˈɑːɡrəfi/", "地理", "初中"),
-            ("biology", "/baɪˈɑːlədʒi/", "生物", "初中"),
-            ("chemistry", "/ˈkeməstri/", "化学", "初中"),
-            ("physics", "/ˈfɪzɪks/", "物理", "初中"),
-            ("memory", "/ˈmeməri/", "记忆", "初中"),
-            ("language", "/ˈlæŋɡwɪdʒ/", "语言", "初中"),
-            ("practice", "/ˈpræktɪs/", "练习", "初中"),
-            ("knowledge", "/ˈnɑːlɪdʒ/", "知识", "初中"),
-            ("education", "/ˌedʒuˈkeɪʃn/", "教育", "初中"),
-            ("student", "/ˈstuːdnt/", "学生", "初中"),
-            ("teacher", "/ˈtiːtʃər/", "老师", "初中"),
-            ("school", "/skuːl/", "学校", "初中"),
-            ("library", "/ˈlaɪbreri/", "图书馆", "初中"),
-            ("hospital", "/ˈhɑːspɪtl/", "医院", "初中"),
-            ("restaurant", "/ˈrestərɑːnt/", "餐厅", "初中"),
-            ("supermarket", "/ˈsuːpərmɑːrkɪt/", "超市", "初中"),
-            ("airport", "/ˈerpɔːrt/", "机场", "初中"),
-            ("station", "/ˈsteɪʃn/", "车站", "初中"),
-            ("country", "/ˈkʌntri/", "国家", "初中"),
-            ("city", "/ˈsɪti/", "城市", "初中"),
-            ("village", "/ˈvɪlɪdʒ/", "村庄", "初中"),
-            ("mountain", "/ˈmaʊntən/", "山", "初中"),
-            ("river", "/ˈrɪvər/", "河", "初中"),
-            ("ocean", "/ˈoʊʃn/", "海洋", "初中"),
-            ("weather", "/ˈweðər/", "天气", "初中"),
-            ("season", "/ˈsiːzn/", "季节", "初中"),
-            ("spring", "/sprɪŋ/", "春天", "初中"),
-            ("summer", "/ˈsʌmər/", "夏天", "初中"),
-            ("autumn", "/ˈɔːtəm/", "秋天", "初中"),
-            ("winter", "/ˈwɪntər/", "冬天", "初中"),
-            
-            # 高中词汇 (学术和抽象概念)
-            ("achievement", "/əˈtʃiːvmənt/", "成就", "高中"),
-            ("opportunity", "/ˌɑːpərˈtuːnəti/", "机会", "高中"),
-            ("experience", "/ɪkˈspɪriəns/", "经验", "高中"),
-            ("development", "/dɪˈveləpmənt/", "发展", "高中"),
-            ("environment", "/ɪnˈvaɪrənmənt/", "环境", "高中"),
-            ("technology", "/tekˈnɑːlədʒi/", "技术", "高中"),
-            ("information", "/ˌɪnfərˈmeɪʃn/", "信息", "高中"),
-            ("communication", "/kəˌmjuːnɪˈkeɪʃn/", "交流", "高中"),
-            ("organization", "/ˌɔːrɡənəˈzeɪʃn/", "组织", "高中"),
-            ("responsibility", "/rɪˌspɑːnsəˈbɪləti/", "责任", "高中"),
-            ("government", "/ˈɡʌvərnmənt/", "政府", "高中"),
-            ("democracy", "/dɪˈmɑːkrəsi/", "民主", "高中"),
-            ("economy", "/ɪˈkɑːnəmi/", "经济", "高中"),
-            ("society", "/səˈsaɪəti/", "社会", "高中"),
-            ("culture", "/ˈkʌltʃər/", "文化", "高中"),
-            ("tradition", "/trəˈdɪʃn/", "传统", "高中"),
-            ("literature", "/ˈlɪtərətʃər/", "文学", "高中"),
-            ("philosophy", "/fəˈlɑːsəfi/", "哲学", "高中"),
-            ("psychology", "/saɪˈkɑːlədʒi/", "心理学", "高中"),
-            ("sociology", "/ˌsoʊsiˈɑːlədʒi/", "社会学", "高中"),
-            ("anthropology", "/ˌænθrəˈpɑːlədʒi/", "人类学", "高中"),
-            ("archaeology", "/ˌɑːrkiˈɑːlədʒi/", "考古学", "高中"),
-            ("architecture", "/ˈɑːrkɪtektʃər/", "建筑学", "高中"),
-            ("engineering", "/ˌendʒɪˈnɪrɪŋ/", "工程学", "高中"),
-            ("medicine", "/ˈmedsn/", "医学", "高中"),
-            ("agriculture", "/ˈæɡrɪkʌltʃər/", "农业", "高中"),
-            ("industry", "/ˈɪndəstri/", "工业", "高中"),
-            ("commerce", "/ˈkɑːmərs/", "商业", "高中"),
-            ("finance", "/ˈfaɪnæns/", "金融", "高中"),
-            ("investment", "/ɪnˈvestmənt/", "投资", "高中"),
-            ("management", "/ˈmænɪdʒmənt/", "管理", "高中"),
-            ("leadership", "/ˈliːdərʃɪp/", "领导力", "高中"),
-            ("innovation", "/ˌɪnəˈveɪʃn/", "创新", "高中"),
-            ("creativity", "/ˌkriːeɪˈtɪvəti/", "创造力", "高中"),
-            ("imagination", "/ɪˌmædʒɪˈneɪʃn/", "想象力", "高中"),
-            ("intelligence", "/ɪnˈtelɪdʒəns/", "智力", "高中"),
-            ("wisdom", "/ˈwɪzdəm/", "智慧", "高中"),
-            ("courage", "/ˈkɜːrɪdʒ/", "勇气", "高中"),
-            ("patience", "/ˈpeɪʃns/", "耐心", "高中"),
-            ("perseverance", "/ˌpɜːrsəˈvɪrəns/", "毅力", "高中"),
-            ("determination", "/dɪˌtɜːrmɪˈneɪʃn/", "决心", "高中"),
-            
-            # 大学词汇 (专业和高级概念)
-            ("sophisticated", "/səˈfɪstɪkeɪtɪd/", "复杂的", "大学"),
-            ("comprehensive", "/ˌkɑːmprɪˈhensɪv/", "全面的", "大学"),
-            ("extraordinary", "/ɪkˈstrɔːrdəneri/", "非凡的", "大学"),
-            ("revolutionary", "/ˌrevəˈluːʃəneri/", "革命性的", "大学"),
-            ("unprecedented", "/ʌnˈpresɪdentɪd/", "史无前例的", "大学"),
-            ("philosophical", "/ˌfɪləˈsɑːfɪkl/", "哲学的", "大学"),
-            ("psychological", "/ˌsaɪkəˈlɑːdʒɪkl/", "心理的", "大学"),
-            ("entrepreneurial", "/ˌɑːntrəprəˈnɜːriəl/", "企业家的", "大学"),
-            ("interdisciplinary", "/ˌɪntərdɪsəˈplɪneri/", "跨学科的", "大学"),
-            ("metamorphosis", "/ˌmetəˈmɔːrfəsɪs/", "变形", "大学"),
-            ("paradigm", "/ˈpærədaɪm/", "范式", "大学"),
-            ("hypothesis", "/haɪˈpɑːθəsɪs/", "假设", "大学"),
-            ("methodology", "/ˌmeθəˈdɑːlədʒi/", "方法论", "大学"),
-            ("epistemology", "/ɪˌpɪstəˈmɑːlədʒi/", "认识论", "大学"),
-            ("phenomenology", "/fɪˌnɑːməˈnɑːlədʒi/", "现象学", "大学"),
-            ("existentialism", "/ɪɡˌzɪstenʃəˈlɪzəm/", "存在主义", "大学"),
-            ("postmodernism", "/ˌpoʊstˈmɑːdərnɪzəm/", "后现代主义", "大学"),
-            ("globalization", "/ˌɡloʊbələˈzeɪʃn/", "全球化", "大学"),
-            ("sustainability", "/səˌsteɪnəˈbɪləti/", "可持续性", "大学"),
-            ("biodiversity", "/ˌbaɪoʊdaɪˈvɜːrsəti/", "生物多样性", "大学"),
-            ("biotechnology", "/ˌbaɪoʊtekˈnɑːlədʒi/", "生物技术", "大学"),
-            ("nanotechnology", "/ˌnænoʊtekˈnɑːlədʒi/", "纳米技术", "大学"),
-            ("artificial intelligence", "/ˌɑːrtɪˈfɪʃl ɪnˈtelɪdʒəns/", "人工智能", "大学"),
-            ("quantum mechanics", "/ˈkwɑːntəm məˈkænɪks/", "量子力学", "大学"),
-            ("thermodynamics", "/ˌθɜːrmoʊdaɪˈnæmɪks/", "热力学", "大学"),
-            ("electromagnetic", "/ɪˌlektroʊmæɡˈnetɪk/", "电磁的", "大学"),
-            ("photosynthesis", "/ˌfoʊtoʊˈsɪnθəsɪs/", "光合作用", "大学"),
-            ("metabolism", "/məˈtæbəlɪzəm/", "新陈代谢", "大学"),
-            ("chromosome", "/ˈkroʊməsoʊm/", "染色体", "大学"),
-            ("mitochondria", "/ˌmaɪtəˈkɑːndriə/", "线粒体", "大学"),
-            ("neuroscience", "/ˈnʊroʊsaɪəns/", "神经科学", "大学"),
-            ("cognitive", "/ˈkɑːɡnətɪv/", "认知的", "大学"),
-            ("consciousness", "/ˈkɑːnʃəsnəs/", "意识", "大学"),
-            ("subconscious", "/sʌbˈkɑːnʃəs/", "潜意识", "大学"),
-            ("psychoanalysis", "/ˌsaɪkoʊəˈnæləsɪs/", "精神分析", "大学"),
-            ("behaviorism", "/bɪˈheɪvjərɪzəm/", "行为主义", "大学"),
-            ("constructivism", "/kənˈstrʌktɪvɪzəm/", "建构主义", "大学"),
-            ("empiricism", "/ɪmˈpɪrɪsɪzəm/", "经验主义", "大学"),
-            ("rationalism", "/ˈræʃnəlɪzəm/", "理性主义", "大学"),
-            ("dialectical", "/ˌdaɪəˈlektɪkl/", "辩证的", "大学"),
-            ("synthesis", "/ˈsɪnθəsɪs/", "综合", "大学"),
-            ("antithesis", "/ænˈtɪθəsɪs/", "对立", "大学"),
-            ("juxtaposition", "/ˌdʒʌkstəpəˈzɪʃn/", "并置", "大学")
-        ]
-        
-        for word, pronunciation, meaning, level in default_words:
-            cursor.execute('''
+        # 一个事务内批量插入
+        with self._transaction() as cursor:
+            cursor.executemany('''
                 INSERT INTO words (word, pronunciation, meaning, level)
                 VALUES (?, ?, ?, ?)
-            ''', (word, pronunciation, meaning, level))
-        
-        conn.commit()
-        conn.close()
+            ''', default_words)
+            cursor.execute(_SQL_INIT_PROGRESS)
     
-    def hash_password(self, password):
-        """密码哈希"""
+    def hash_password(self, password, salt):
+        """密码哈希 - 加盐的PBKDF2-SHA256"""
+        return hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt,
+                                   _PBKDF2_ITERATIONS).hex()
+    
+    def _legacy_hash_password(self, password):
+        """旧版无盐SHA-256哈希，仅用于校验升级前注册的账户"""
         return hashlib.sha256(password.encode()).hexdigest()
     
     def register_user(self, username, password, email=""):
         """注册用户"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
+        salt = os.urandom(16)
+        password_hash = self.hash_password(password, salt)
         try:
-            password_hash = self.hash_password(password)
-            cursor.execute('''
-                INSERT INTO users (username, password_hash, email)
-                VALUES (?, ?, ?)
-            ''', (username, password_hash, email))
-            
-            user_id = cursor.lastrowid
-            conn.commit()
-            conn.close()
-            return user_id
+            with self._transaction() as cursor:
+                cursor.execute('''
+                    INSERT INTO users (username, password_hash, email, salt)
+                    VALUES (?, ?, ?, ?)
+                ''', (username, password_hash, email, salt))
+                user_id = cursor.lastrowid
+                cursor.execute(_SQL_INIT_USER_PROGRESS, (user_id,))
+                return user_id
         except sqlite3.IntegrityError:
-            conn.close()
             return None
     
     def login_user(self, username, password):
         """用户登录"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._cursor() as cursor:
+            cursor.execute('''
+                SELECT id, password_hash, salt FROM users 
+                WHERE username = ?
+            ''', (username,))
+            result = cursor.fetchone()
         
-        password_hash = self.hash_password(password)
-        cursor.execute('''
-            SELECT id FROM users 
-            WHERE username = ? AND password_hash = ?
-        ''', (username, password_hash))
+        if not result:
+            return False
         
-        result = cursor.fetchone()
-        if result:
-            user_id = result[0]
+        user_id, stored_hash, salt = result
+        if salt is None:
+            # 旧账户：校验无盐哈希，成功后升级为PBKDF2
+            if not hmac.compare_digest(stored_hash, self._legacy_hash_password(password)):
+                return False
+            salt = os.urandom(16)
+            new_hash = self.hash_password(password, salt)
+        else:
+            if not hmac.compare_digest(stored_hash, self.hash_password(password, salt)):
+                return False
+            new_hash = None
+        
+        with self._transaction() as cursor:
+            if new_hash:
+                cursor.execute('''
+                    UPDATE users SET password_hash = ?, salt = ? 
+                    WHERE id = ?
+                ''', (new_hash, salt, user_id))
+            
             # 更新最后登录时间
             cursor.execute('''
                 UPDATE users SET last_login = CURRENT_TIMESTAMP 
                 WHERE id = ?
             ''', (user_id,))
-            conn.commit()
-            self.current_user_id = user_id
         
-        conn.close()
-        return result is not None
+        self.current_user_id = user_id
+        return True
     
     def get_user_info(self, user_id=None):
         """获取用户信息"""
         if user_id is None:
             user_id = self.current_user_id
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT username, email, created_at, last_login 
-            FROM users WHERE id = ?
-        ''', (user_id,))
-        
-        result = cursor.fetchone()
-        conn.close()
-        return result
+        with self._cursor() as cursor:
+            cursor.execute('''
+                SELECT username, email, created_at, last_login 
+                FROM users WHERE id = ?
+            ''', (user_id,))
+            return cursor.fetchone()
     
     def get_words_for_review(self, limit=10, level=None):
         """获取需要复习的单词"""
-        if not self.current_user_id:
+        if not self.current_user_id or self._closed:
             return []
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        # 先等排队的进度写入完成，避免刚答过的单词再次出现
+        self.flush()
         
-        # 获取用户需要复习的单词，排除已经连续三次正确的单词
-        query = '''
-            SELECT w.id, w.word, w.pronunciation, w.meaning, w.level,
-                   COALESCE(uwp.review_count, 0) as review_count,
-                   COALESCE(uwp.correct_count, 0) as correct_count,
-                   COALESCE(uwp.difficulty, 1) as difficulty,
-                   COALESCE(uwp.mastery_level, 0) as mastery_level,
-                   COALESCE(uwp.consecutive_correct, 0) as consecutive_correct
-            FROM words w
-            LEFT JOIN user_word_progress uwp ON w.id = uwp.word_id AND uwp.user_id = ?
-            WHERE (uwp.next_review_date IS NULL OR uwp.next_review_date <= ?)
-            AND COALESCE(uwp.consecutive_correct, 0) < 3
-        '''
-        
-        params = [self.current_user_id, datetime.now()]
-        
-        if level:
-            query += ' AND w.level = ?'
-            params.append(level)
-        
-        query += ' ORDER BY COALESCE(uwp.next_review_date, w.created_at) ASC LIMIT ?'
-        params.append(limit)
-        
-        cursor.execute(query, params)
-        words = cursor.fetchall()
-        conn.close()
-        return words
+        # 两条固定文本的查询，始终命中sqlite3的语句缓存
+        now = int(time.time())
+        with self._read_cursor() as cursor:
+            if level:
+                cursor.execute(_SQL_REVIEW_BY_LEVEL, (self.current_user_id, now, level, limit))
+            else:
+                cursor.execute(_SQL_REVIEW_ALL, (self.current_user_id, now, limit))
+            return cursor.fetchall()
     
     def update_word_progress(self, word_id, is_correct, study_mode):
         """更新单词学习进度 - 智能记忆算法"""
         if not self.current_user_id:
             return
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # 获取或创建用户单词进度记录
-        cursor.execute('''
-            SELECT review_count, correct_count, difficulty, mastery_level, consecutive_correct
-            FROM user_word_progress 
-            WHERE user_id = ? AND word_id = ?
-        ''', (self.current_user_id, word_id))
-        
-        result = cursor.fetchone()
+        # 进度先在内存中计算，写入交给后台线程批量提交
+        now = int(time.time())
+        key = (self.current_user_id, word_id)
+        result = self._progress_cache.get(key)
+        if result is None:
+            with self._cursor() as cursor:
+                cursor.execute('''
+                    SELECT review_count, correct_count, difficulty, mastery_level, consecutive_correct
+                    FROM user_word_progress 
+                    WHERE user_id = ? AND word_id = ?
+                ''', key)
+                result = cursor.fetchone()
         if result:
             review_count, correct_count, difficulty, mastery_level, consecutive_correct = result
         else:
@@ -613,199 +716,307 @@ class UserDatabase:
         # 智能复习时间计算
         if consecutive_correct >= 3:
             # 连续三次正确，停止记忆（设置很远的复习时间）
-            next_review = datetime.now() + timedelta(days=365)  # 一年后
+            next_review = now + _MASTERED_REVIEW
             mastery_level = 5  # 标记为完全掌握
         elif is_correct:
             # 正确答案 - 使用记忆曲线
-            if mastery_level <= 1:
-                next_review = datetime.now() + timedelta(minutes=20)  # 20分钟后
-            elif mastery_level == 2:
-                next_review = datetime.now() + timedelta(hours=1)    # 1小时后
-            elif mastery_level == 3:
-                next_review = datetime.now() + timedelta(hours=8)    # 8小时后
-            elif mastery_level == 4:
-                next_review = datetime.now() + timedelta(days=1)     # 1天后
-            else:
-                next_review = datetime.now() + timedelta(days=2)     # 2天后
+            next_review = now + _NEXT_REVIEW_OK[mastery_level]
         else:
             # 错误答案 - 加入重复记忆
-            if difficulty >= 4:
-                next_review = datetime.now() + timedelta(minutes=5)   # 5分钟后重复
-            elif difficulty >= 3:
-                next_review = datetime.now() + timedelta(minutes=10)  # 10分钟后重复
-            else:
-                next_review = datetime.now() + timedelta(minutes=15)  # 15分钟后重复
-        
-        # 更新或插入进度记录
-        cursor.execute('''
-            INSERT OR REPLACE INTO user_word_progress 
-            (user_id, word_id, review_count, correct_count, difficulty, 
-             last_review_date, next_review_date, mastery_level, consecutive_correct)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (self.current_user_id, word_id, review_count, correct_count, 
-              difficulty, datetime.now(), next_review, mastery_level, consecutive_correct))
-        
-        # 添加学习记录
-        cursor.execute('''
-            INSERT INTO study_records 
-            (user_id, word_id, is_correct, study_mode)
-            VALUES (?, ?, ?, ?)
-        ''', (self.current_user_id, word_id, is_correct, study_mode))
-        
-        conn.commit()
-        conn.close()
+            next_review = now + _NEXT_REVIEW_FAIL[difficulty]
+        
+        self._progress_cache[key] = (review_count, correct_count, difficulty,
+                                     mastery_level, consecutive_correct)
+        self._write_queue.put_nowait((
+            (self.current_user_id, word_id, review_count, correct_count,
+             difficulty, now, next_review, mastery_level, consecutive_correct),
+            (self.current_user_id, word_id, is_correct, study_mode),
+        ))
+        self._stats_dirty.add(self.current_user_id)
     
     def get_user_statistics(self):
         """获取用户学习统计"""
-        if not self.current_user_id:
+        if not self.current_user_id or self._closed:
             return {}
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # 总单词数
-        cursor.execute('SELECT COUNT(*) FROM words')
-        total_words = cursor.fetchone()[0]
-        
-        # 已学习单词数
-        cursor.execute('''
-            SELECT COUNT(*) FROM user_word_progress 
-            WHERE user_id = ? AND review_count > 0
-        ''', (self.current_user_id,))
-        studied_words = cursor.fetchone()[0]
-        
-        # 已掌握单词数（连续三次正确）
-        cursor.execute('''
-            SELECT COUNT(*) FROM user_word_progress 
-            WHERE user_id = ? AND consecutive_correct >= 3
-        ''', (self.current_user_id,))
-        mastered_words = cursor.fetchone()[0]
-        
-        # 今日学习数
+        # 进度没有变化且仍是同一天时直接返回缓存的结果
+        user_id = self.current_user_id
         today = date.today()
-        cursor.execute('''
-            SELECT COUNT(DISTINCT word_id) FROM study_records 
-            WHERE user_id = ? AND DATE(study_date) = ?
-        ''', (self.current_user_id, today))
-        today_studied = cursor.fetchone()[0]
-        
-        # 正确率
-        cursor.execute('''
-            SELECT AVG(CAST(is_correct AS FLOAT)) * 100 FROM study_records 
-            WHERE user_id = ?
-        ''', (self.current_user_id,))
-        accuracy = cursor.fetchone()[0] or 0
-        
-        # 掌握程度分布
-        cursor.execute('''
-            SELECT mastery_level, COUNT(*) FROM user_word_progress 
-            WHERE user_id = ? GROUP BY mastery_level
-        ''', (self.current_user_id,))
-        mastery_distribution = dict(cursor.fetchall())
-        
-        # 连续正确次数分布
-        cursor.execute('''
-            SELECT consecutive_correct, COUNT(*) FROM user_word_progress 
-            WHERE user_id = ? AND review_count > 0 GROUP BY consecutive_correct
-        ''', (self.current_user_id,))
-        consecutive_distribution = dict(cursor.fetchall())
-        
-        conn.close()
-        return {
+        cached = self._stats_cache.get(user_id)
+        if cached and cached[0] == today and user_id not in self._stats_dirty:
+            return cached[1]
+        self._stats_dirty.discard(user_id)
+        
+        self.flush()
+        with self._read_cursor() as cursor:
+            # 总单词数、已学习单词数、已掌握单词数（连续三次正确）及学习进度：一次扫描
+            cursor.execute('''
+                SELECT total, studied, mastered, ROUND(mastered * 100.0 / MAX(total, 1), 1)
+                FROM (
+                    SELECT (SELECT COUNT(*) FROM words) AS total,
+                           COALESCE(SUM(CASE WHEN review_count > 0 THEN 1 ELSE 0 END), 0) AS studied,
+                           COALESCE(SUM(CASE WHEN consecutive_correct >= 3 THEN 1 ELSE 0 END), 0) AS mastered
+                    FROM user_word_progress 
+                    WHERE user_id = ?
+                )
+            ''', (self.current_user_id,))
+            total_words, studied_words, mastered_words, progress = cursor.fetchone()
+            
+            # 今日学习数、正确率：一次扫描
+            cursor.execute('''
+                SELECT COUNT(DISTINCT CASE WHEN DATE(study_date) = ? THEN word_id END),
+                       AVG(CAST(is_correct AS FLOAT)) * 100
+                FROM study_records 
+                WHERE user_id = ?
+            ''', (today, self.current_user_id))
+            today_studied, accuracy = cursor.fetchone()
+            accuracy = accuracy or 0
+            
+            # 掌握程度分布
+            cursor.execute('''
+                SELECT mastery_level, COUNT(*) FROM user_word_progress 
+                WHERE user_id = ? AND review_count > 0 GROUP BY mastery_level
+            ''', (self.current_user_id,))
+            mastery_distribution = dict(cursor.fetchall())
+            
+            # 连续正确次数分布
+            cursor.execute('''
+                SELECT consecutive_correct, COUNT(*) FROM user_word_progress 
+                WHERE user_id = ? AND review_count > 0 GROUP BY consecutive_correct
+            ''', (self.current_user_id,))
+            consecutive_distribution = dict(cursor.fetchall())
+        
+        stats = {
             'total_words': total_words,
             'studied_words': studied_words,
             'mastered_words': mastered_words,
             'today_studied': today_studied,
             'accuracy': round(accuracy, 1),
+            'progress': progress,
             'mastery_distribution': mastery_distribution,
             'consecutive_distribution': consecutive_distribution
         }
-    
-    def save_system_state(self, key, value):
-        """保存系统状态"""
-        if not self.current_user_id:
-            return False
-        
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # 使用INSERT OR REPLACE来更新或插入
-        cursor.execute('''
-            INSERT OR REPLACE INTO system_state (user_id, state_key, state_value)
-            VALUES (?, ?, ?)
-        ''', (self.current_user_id, key, json.dumps(value)))
-        
-        conn.commit()
-        conn.close()
-        return True
-    
-    def load_system_state(self, key, default_value=None):
-        """加载系统状态"""
-        if not self.current_user_id:
-            return default_value
-        
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT state_value FROM system_state 
-            WHERE user_id = ? AND state_key = ?
-        ''', (self.current_user_id, key))
-        
-        result = cursor.fetchone()
-        conn.close()
-        
-        if result:
-            try:
-                return json.loads(result[0])
-            except json.JSONDecodeError:
-                return default_value
-        return default_value
+        self._stats_cache[user_id] = (today, stats)
+        return stats
     
     def get_all_system_states(self):
         """获取所有系统状态"""
         if not self.current_user_id:
             return {}
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT state_key, state_value FROM system_state 
-            WHERE user_id = ?
-        ''', (self.current_user_id,))
+        with self._cursor() as cursor:
+            cursor.execute('''
+                SELECT state_key, state_value FROM system_state 
+                WHERE user_id = ?
+            ''', (self.current_user_id,))
+            rows = cursor.fetchall()
         
         states = {}
-        for key, value in cursor.fetchall():
+        for key, value in rows:
             try:
                 states[key] = json.loads(value)
-            except json.JSONDecodeError:
+            except ValueError:
                 states[key] = value
-        
-        conn.close()
         return states
-    
-    def clear_system_state(self, key=None):
-        """清除系统状态"""
-        if not self.current_user_id:
-            return False
-        
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        if key:
-            cursor.execute('''
-                DELETE FROM system_state 
-                WHERE user_id = ? AND state_key = ?
-            ''', (self.current_user_id, key))
-        else:
-            cursor.execute('''
-                DELETE FROM system_state WHERE user_id = ?
-            ''', (self.current_user_id,))
-        
-        conn.commit()
-        conn.close()
-        return True
+
+@lru_cache(maxsize=None)
+def _font(size, bold=False, family="Microsoft YaHei"):
+    """界面字体，同样的字号和粗细只构造一次，首次使用时才创建（此时QApplication已存在）"""
+    if bold:
+        return QFont(family, size, QFont.Weight.Bold)
+    return QFont(family, size)
+
+# 界面样式表，在模块加载时构造一次，各控件直接引用同一个字符串
+_LOGIN_QSS = """
+    QDialog {
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
+            stop:0 #667eea, stop:1 #764ba2);
+    }
+    QLabel {
+        color: white;
+        font-weight: bold;
+        font-size: 14px;
+    }
+    QLineEdit {
+        padding: 15px;
+        border: 2px solid white;
+        border-radius: 10px;
+        background-color: rgba(255,255,255,0.95);
+        font-size: 16px;
+        min-height: 20px;
+    }
+    QLineEdit:focus {
+        border: 3px solid #f1c40f;
+        background-color: white;
+    }
+    QPushButton {
+        padding: 15px 20px;
+        border: none;
+        border-radius: 10px;
+        background-color: #2ecc71;
+        color: white;
+        font-weight: bold;
+        font-size: 16px;
+        min-height: 20px;
+    }
+    QPushButton:hover {
+        background-color: #27ae60;
+    }
+    QPushButton:pressed {
+        background-color: #229954;
+    }
+    QLabel#loginTitle {
+        margin-bottom: 10px;
+    }
+"""
+
+# 统计卡片：(统计项, 标题, 颜色)，按顺序每行三张
+_STAT_CARDS = (
+    ('total_words', "📚 总单词数", "#3498db"),
+    ('studied_words', "✅ 已学习", "#2ecc71"),
+    ('mastered_words', "🏆 已掌握", "#9b59b6"),
+    ('today_studied', "🎯 今日学习", "#e74c3c"),
+    ('accuracy', "🎖️ 正确率", "#f39c12"),
+    ('progress', "📈 学习进度", "#1abc9c"),
+)
+# 以百分比显示的统计项
+_PERCENT_STATS = ('accuracy', 'progress')
+
+# 统计卡片样式：按 cardColor 属性选择背景色
+_STAT_CARD_COLORS = tuple(color for _, _, color in _STAT_CARDS)
+_STAT_CARD_QSS = """
+    QWidget#statCard {
+        border-radius: 15px;
+        margin: 5px;
+    }
+    QWidget#statCard QLabel {
+        color: white;
+    }
+""" + "".join(f"""
+    QWidget#statCard[cardColor="{color}"] {{
+        background-color: {color};
+    }}""" for color in _STAT_CARD_COLORS)
+
+# 学习和设置页面共用的分组框样式
+_GROUPBOX_QSS = """
+    QGroupBox {
+        font-weight: bold;
+        border: 2px solid #3498db;
+        border-radius: 10px;
+        margin-top: 10px;
+        padding-top: 10px;
+        background-color: #f8f9fa;
+    }
+    QGroupBox::title {
+        subcontrol-origin: margin;
+        left: 20px;
+        padding: 0 10px 0 10px;
+        color: #2c3e50;
+    }
+"""
+
+# 学习结果标签：按 state 属性切换配色，答题时只需改属性，不必重新解析样式表
+_RESULT_QSS = """
+    QLabel#resultLabel {
+        background-color: #ecf0f1;
+        border-radius: 15px;
+        padding: 15px;
+        margin: 10px 0;
+    }
+    QLabel#resultLabel[state="correct"],
+    QLabel#resultLabel[state="wrong"],
+    QLabel#resultLabel[state="answer"] {
+        color: white;
+        font-weight: bold;
+    }
+    QLabel#resultLabel[state="correct"] {
+        background-color: #2ecc71;
+    }
+    QLabel#resultLabel[state="wrong"] {
+        background-color: #e74c3c;
+    }
+    QLabel#resultLabel[state="answer"] {
+        background-color: #f39c12;
+    }
+"""
+
+# 学习页面按钮：四个按钮只差配色，按对象名选择
+_STUDY_BUTTON_QSS = """
+    QPushButton#btnDanger, QPushButton#btnSuccess,
+    QPushButton#btnWarning, QPushButton#btnInfo {
+        border: none;
+        border-radius: 22px;
+        color: white;
+        padding: 0 25px;
+        font-weight: bold;
+    }
+    QPushButton#btnDanger {
+        background-color: #e74c3c;
+        border-radius: 25px;
+        padding: 0 30px;
+    }
+    QPushButton#btnDanger:hover {
+        background-color: #c0392b;
+    }
+    QPushButton#btnSuccess {
+        background-color: #2ecc71;
+    }
+    QPushButton#btnSuccess:hover {
+        background-color: #27ae60;
+    }
+    QPushButton#btnWarning {
+        background-color: #f39c12;
+    }
+    QPushButton#btnWarning:hover {
+        background-color: #e67e22;
+    }
+    QPushButton#btnInfo {
+        background-color: #3498db;
+    }
+    QPushButton#btnInfo:hover {
+        background-color: #2980b9;
+    }
+    QPushButton#btnSuccess:disabled, QPushButton#btnWarning:disabled,
+    QPushButton#btnInfo:disabled {
+        background-color: #bdc3c7;
+        color: #7f8c8d;
+    }
+"""
+
+# 主窗口、标签页和状态栏样式；字体族由应用默认字体统一提供，不在样式表中逐类设置
+_APP_QSS = """
+    QMainWindow {
+        background-color: #f5f5f5;
+    }
+    QTabWidget::pane {
+        border: 1px solid #c0c0c0;
+        background-color: white;
+        border-radius: 8px;
+    }
+    QTabBar::tab {
+        background-color: #e1e1e1;
+        padding: 12px 20px;
+        margin-right: 2px;
+        border-top-left-radius: 8px;
+        border-top-right-radius: 8px;
+        font-weight: bold;
+        font-size: 12px;
+    }
+    QTabBar::tab:selected {
+        background-color: white;
+        border-bottom: 3px solid #3498db;
+    }
+    QTabBar::tab:hover {
+        background-color: #d5d5d5;
+    }
+    QStatusBar {
+        font-size: 11px;
+        color: #2c3e50;
+    }
+"""
+
+# 应用级样式表，在 main() 中设置一次，所有页面共用同一份解析结果
+_GLOBAL_QSS = _APP_QSS + _GROUPBOX_QSS + _STAT_CARD_QSS + _RESULT_QSS + _STUDY_BUTTON_QSS
 
 class LoginDialog(QDialog):
     """登录对话框"""
@@ -817,45 +1028,7 @@ class LoginDialog(QDialog):
     def init_ui(self):
         self.setWindowTitle("单词记忆助手 - 用户登录")
         self.setFixedSize(450, 400)
-        self.setStyleSheet("""
-            QDialog {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1, 
-                    stop:0 #667eea, stop:1 #764ba2);
-            }
-            QLabel {
-                color: white;
-                font-weight: bold;
-                font-size: 14px;
-            }
-            QLineEdit {
-                padding: 15px;
-                border: 2px solid white;
-                border-radius: 10px;
-                background-color: rgba(255,255,255,0.95);
-                font-size: 16px;
-                min-height: 20px;
-            }
-            QLineEdit:focus {
-                border: 3px solid #f1c40f;
-                background-color: white;
-            }
-            QPushButton {
-                padding: 15px 20px;
-                border: none;
-                border-radius: 10px;
-                background-color: #2ecc71;
-                color: white;
-                font-weight: bold;
-                font-size: 16px;
-                min-height: 20px;
-            }
-            QPushButton:hover {
-                background-color: #27ae60;
-            }
-            QPushButton:pressed {
-                background-color: #229954;
-            }
-        """)
+        self.setStyleSheet(_LOGIN_QSS)
         
         layout = QVBoxLayout()
         layout.setSpacing(25)
@@ -863,14 +1036,14 @@ class LoginDialog(QDialog):
         
         # 标题
         title = QLabel("🎓 单词记忆助手")
-        title.setFont(QFont("Microsoft YaHei", 24, QFont.Weight.Bold))
+        title.setFont(_font(24, bold=True))
         title.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        title.setStyleSheet("margin-bottom: 10px;")
+        title.setObjectName("loginTitle")
         layout.addWidget(title)
         
         # 用户名
         username_label = QLabel("用户名:")
-        username_label.setFont(QFont("Microsoft YaHei", 12))
+        username_label.setFont(_font(12))
         layout.addWidget(username_label)
         
         self.username_edit = QLineEdit()
@@ -879,7 +1052,7 @@ class LoginDialog(QDialog):
         
         # 密码
         password_label = QLabel("密码:")
-        password_label.setFont(QFont("Microsoft YaHei", 12))
+        password_label.setFont(_font(12))
         layout.addWidget(password_label)
         
         self.password_edit = QLineEdit()
@@ -941,6 +1114,72 @@ class LoginDialog(QDialog):
         else:
             QMessageBox.warning(self, "注册失败", "用户名已存在！")
 
+# 每轮学习的单词数
+_REVIEW_BATCH_SIZE = 10
+
+# 切换学习模式后延迟保存的毫秒数
+_SAVE_MODE_DELAY_MS = 300
+
+# 学习模式及其保存在系统状态中的显示名称
+_STUDY_MODE_NAMES = {"spelling": "拼写练习", "meaning": "词义练习", "mixed": "混合模式"}
+
+# 旧版本保存自动发音偏好的全局键，现在按用户保存，只在迁移时读取
+_LEGACY_AUTO_PLAY_KEY = "study/auto_play"
+
+def _state_group(db):
+    """当前用户的界面状态（窗口位置、标签页、学习设置）在QSettings中的分组"""
+    return f"users/{db.current_user_id}"
+
+def _state_key(db, key):
+    """当前用户某项界面状态在QSettings中的键"""
+    return f"{_state_group(db)}/{key}"
+
+# 答案规范化：全角标点转为半角，去掉半角和全角空格，一次translate完成
+_NORMALIZE = str.maketrans({
+    "，": ",", "。": ".", "；": ";", "：": ":", "！": "!", "？": "?",
+    " ": "", "\u3000": "",
+})
+
+class _FetchWordsSignals(QObject):
+    """预取任务的信号，QRunnable本身不能发信号"""
+    finished = pyqtSignal(int, object, list)  # generation, level, words
+
+class _FetchWordsTask(QRunnable):
+    """在线程池中预取下一轮要复习的单词"""
+    def __init__(self, db, generation, level, exclude_ids):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.db = db
+        self.generation = generation
+        self.level = level
+        self.exclude_ids = exclude_ids
+        self.signals = _FetchWordsSignals()
+    
+    def run(self):
+        # 本轮还没答完的单词仍然到期，多取一些再排除掉
+        try:
+            words = self.db.get_words_for_review(limit=_REVIEW_BATCH_SIZE + len(self.exclude_ids),
+                                                 level=self.level)
+        except sqlite3.Error as e:
+            print(f"⚠️ 预取单词失败: {e}")
+            words = []
+        words = [w for w in words if w[0] not in self.exclude_ids][:_REVIEW_BATCH_SIZE]
+        self.signals.finished.emit(self.generation, self.level, words)
+
+class _WordCard(QWidget):
+    """单词显示区域的圆角色块，直接绘制，不经过样式表匹配"""
+    _COLOR = QColor("#667eea")
+    _MARGIN = 10
+    _RADIUS = 20
+    
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(self._COLOR)
+        rect = QRectF(self.rect()).adjusted(self._MARGIN, self._MARGIN, -self._MARGIN, -self._MARGIN)
+        painter.drawRoundedRect(rect, self._RADIUS, self._RADIUS)
+
 class StudyWidget(QWidget):
     """学习界面"""
     word_completed = pyqtSignal(int, bool, str)  # word_id, is_correct, study_mode
@@ -948,13 +1187,37 @@ class StudyWidget(QWidget):
     def __init__(self, db):
         super().__init__()
         self.db = db
-        self.current_word = None
-        self.current_words = []
+        # 本轮单词按列存放：ID、单词、音标、释义各一个列表，按下标对应
+        self._ids = []
+        self._words = []
+        self._prons = []
+        self._meanings = []
+        self._current = -1  # 正在显示的单词下标，-1表示还没有单词
         self.current_index = 0
         self.study_mode = "spelling"
-        self.tts_engine = TTSEngine()
+        self._displayed_mode = None  # 当前单词实际采用的模式，混合模式下每个单词随机
+        self._rng = random.Random()
+        self._mode_seq = []
+        
+        # 下一轮单词在后台预取，(level, words)；进度重置后代数加一，之前取到的结果作废
+        self._pool = QThreadPool.globalInstance()
+        self._fetch_task = None
+        self._fetch_generation = 0
+        self._prefetched = None
+        
+        # 连续切换模式时只在停下来后保存一次
+        self._save_mode_timer = QTimer(self)
+        self._save_mode_timer.setSingleShot(True)
+        self._save_mode_timer.setInterval(_SAVE_MODE_DELAY_MS)
+        self._save_mode_timer.timeout.connect(self.save_study_mode)
+        
         self.init_ui()
     
+    @cached_property
+    def tts_engine(self):
+        """语音引擎在第一次播放时才创建"""
+        return TTSEngine()
+    
     def init_ui(self):
         layout = QVBoxLayout()
         layout.setSpacing(20)
@@ -962,23 +1225,7 @@ class StudyWidget(QWidget):
         
         # 学习模式选择
         mode_group = QGroupBox("🎯 学习模式")
-        mode_group.setFont(QFont("Microsoft YaHei", 12, QFont.Weight.Bold))
-        mode_group.setStyleSheet("""
-            QGroupBox {
-                font-weight: bold;
-                border: 2px solid #3498db;
-                border-radius: 10px;
-                margin-top: 10px;
-                padding-top: 10px;
-                background-color: #f8f9fa;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 20px;
-                padding: 0 10px 0 10px;
-                color: #2c3e50;
-            }
-        """)
+        mode_group.setFont(_font(12, bold=True))
         
         mode_layout = QHBoxLayout()
         
@@ -989,15 +1236,20 @@ class StudyWidget(QWidget):
         self.meaning_mode = QCheckBox("📖 词义练习")
         self.meaning_mode.toggled.connect(self.on_mode_changed)
         
+        # 自动发音偏好按用户保存在QSettings中，关闭后不会为自动播放创建语音引擎
+        self.auto_play_check = QCheckBox("🔊 自动发音")
+        self.auto_play_check.setChecked(QSettings().value(_state_key(self.db, 'auto_play'), True, type=bool))
+        self.auto_play_check.toggled.connect(self.on_auto_play_changed)
+        
         mode_layout.addWidget(self.spelling_mode)
         mode_layout.addWidget(self.meaning_mode)
         mode_layout.addStretch()
+        mode_layout.addWidget(self.auto_play_check)
         mode_group.setLayout(mode_layout)
         layout.addWidget(mode_group)
         
         # 难度选择
         level_group = QGroupBox("📊 难度选择")
-        level_group.setStyleSheet(mode_group.styleSheet())
         level_layout = QHBoxLayout()
         
         self.level_combo = QComboBox()
@@ -1023,19 +1275,12 @@ class StudyWidget(QWidget):
         layout.addWidget(level_group)
         
         # 单词显示区域
-        word_container = QWidget()
-        word_container.setStyleSheet("""
-            QWidget {
-                background-color: #667eea;
-                border-radius: 20px;
-                margin: 10px;
-            }
-        """)
+        word_container = _WordCard()
         word_layout = QVBoxLayout(word_container)
         word_layout.setContentsMargins(40, 30, 40, 30)
         
         self.word_label = QLabel("🎓 点击开始学习")
-        self.word_label.setFont(QFont("Microsoft YaHei", 28, QFont.Weight.Bold))
+        self.word_label.setFont(_font(28, bold=True))
         self.word_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.word_label.setStyleSheet("""
             QLabel {
@@ -1049,11 +1294,10 @@ class StudyWidget(QWidget):
         
         # 发音显示
         pronunciation_container = QWidget()
-        pronunciation_container.setStyleSheet("background: transparent;")
         pronunciation_layout = QHBoxLayout(pronunciation_container)
         
         self.pronunciation_label = QLabel("")
-        self.pronunciation_label.setFont(QFont("Consolas", 16, QFont.Weight.Bold))
+        self.pronunciation_label.setFont(_font(16, bold=True, family="Consolas"))
         self.pronunciation_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.pronunciation_label.setStyleSheet("""
             QLabel {
@@ -1066,7 +1310,7 @@ class StudyWidget(QWidget):
         """)
         
         self.play_button = QPushButton("🔊")
-        self.play_button.setFont(QFont("Arial", 16))
+        self.play_button.setFont(_font(16, family="Arial"))
         self.play_button.clicked.connect(self.play_pronunciation)
         self.play_button.setFixedSize(50, 50)
         self.play_button.setStyleSheet("""
@@ -1095,12 +1339,12 @@ class StudyWidget(QWidget):
         input_layout = QVBoxLayout(input_container)
         
         input_label = QLabel("💭 请输入答案")
-        input_label.setFont(QFont("Microsoft YaHei", 12, QFont.Weight.Bold))
+        input_label.setFont(_font(12, bold=True))
         input_label.setStyleSheet("color: #34495e; margin-left: 5px;")
         input_layout.addWidget(input_label)
         
         self.input_edit = QLineEdit()
-        self.input_edit.setFont(QFont("Microsoft YaHei", 16))
+        self.input_edit.setFont(_font(16))
         self.input_edit.setPlaceholderText("在这里输入答案...")
         self.input_edit.returnPressed.connect(self.check_answer)
         self.input_edit.setStyleSheet("""
@@ -1127,90 +1371,30 @@ class StudyWidget(QWidget):
         
         self.start_button = QPushButton("🚀 开始学习")
         self.start_button.clicked.connect(self.start_study)
-        self.start_button.setFont(QFont("Microsoft YaHei", 14, QFont.Weight.Bold))
+        self.start_button.setFont(_font(14, bold=True))
         self.start_button.setFixedHeight(50)
-        self.start_button.setStyleSheet("""
-            QPushButton {
-                background-color: #e74c3c;
-                border: none;
-                border-radius: 25px;
-                color: white;
-                padding: 0 30px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #c0392b;
-            }
-        """)
+        self.start_button.setObjectName("btnDanger")
         
         self.check_button = QPushButton("✅ 检查答案")
         self.check_button.clicked.connect(self.check_answer)
-        self.check_button.setFont(QFont("Microsoft YaHei", 12, QFont.Weight.Bold))
+        self.check_button.setFont(_font(12, bold=True))
         self.check_button.setFixedHeight(45)
         self.check_button.setEnabled(False)
-        self.check_button.setStyleSheet("""
-            QPushButton {
-                background-color: #2ecc71;
-                border: none;
-                border-radius: 22px;
-                color: white;
-                padding: 0 25px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #27ae60;
-            }
-            QPushButton:disabled {
-                background-color: #bdc3c7;
-                color: #7f8c8d;
-            }
-        """)
+        self.check_button.setObjectName("btnSuccess")
         
         self.show_answer_button = QPushButton("💡 显示答案")
         self.show_answer_button.clicked.connect(self.show_answer)
-        self.show_answer_button.setFont(QFont("Microsoft YaHei", 12, QFont.Weight.Bold))
+        self.show_answer_button.setFont(_font(12, bold=True))
         self.show_answer_button.setFixedHeight(45)
         self.show_answer_button.setEnabled(False)
-        self.show_answer_button.setStyleSheet("""
-            QPushButton {
-                background-color: #f39c12;
-                border: none;
-                border-radius: 22px;
-                color: white;
-                padding: 0 25px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #e67e22;
-            }
-            QPushButton:disabled {
-                background-color: #bdc3c7;
-                color: #7f8c8d;
-            }
-        """)
+        self.show_answer_button.setObjectName("btnWarning")
         
         self.next_button = QPushButton("➡️ 下一个")
         self.next_button.clicked.connect(self.next_word)
-        self.next_button.setFont(QFont("Microsoft YaHei", 12, QFont.Weight.Bold))
+        self.next_button.setFont(_font(12, bold=True))
         self.next_button.setFixedHeight(45)
         self.next_button.setEnabled(False)
-        self.next_button.setStyleSheet("""
-            QPushButton {
-                background-color: #3498db;
-                border: none;
-                border-radius: 22px;
-                color: white;
-                padding: 0 25px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background-color: #2980b9;
-            }
-            QPushButton:disabled {
-                background-color: #bdc3c7;
-                color: #7f8c8d;
-            }
-        """)
+        self.next_button.setObjectName("btnInfo")
         
         button_layout.addWidget(self.start_button)
         button_layout.addWidget(self.check_button)
@@ -1220,17 +1404,10 @@ class StudyWidget(QWidget):
         
         # 结果显示
         self.result_label = QLabel("")
-        self.result_label.setFont(QFont("Microsoft YaHei", 16, QFont.Weight.Bold))
+        self.result_label.setFont(_font(16, bold=True))
         self.result_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.result_label.setMinimumHeight(60)
-        self.result_label.setStyleSheet("""
-            QLabel {
-                background-color: #ecf0f1;
-                border-radius: 15px;
-                padding: 15px;
-                margin: 10px 0;
-            }
-        """)
+        self.result_label.setObjectName("resultLabel")
         layout.addWidget(self.result_label)
         
         self.setLayout(layout)
@@ -1244,47 +1421,94 @@ class StudyWidget(QWidget):
         elif self.meaning_mode.isChecked():
             self.study_mode = "meaning"
         else:
+            # 至少保留拼写练习；屏蔽信号，避免重新进入本函数
+            self.spelling_mode.blockSignals(True)
             self.spelling_mode.setChecked(True)
+            self.spelling_mode.blockSignals(False)
             self.study_mode = "spelling"
         
-        # 保存学习模式状态
-        mode_text = "混合模式" if self.study_mode == "mixed" else ("拼写练习" if self.study_mode == "spelling" else "词义练习")
-        self.db.save_system_state('study_mode', mode_text)
+        self._save_mode_timer.start()
+    
+    def study_mode_text(self):
+        """当前学习模式的显示名称，保存在系统状态中"""
+        return _STUDY_MODE_NAMES[self.study_mode]
+    
+    def apply_study_mode(self, mode_text):
+        """按保存的模式名称勾选模式复选框，不触发保存"""
+        for mode, name in _STUDY_MODE_NAMES.items():
+            if name == mode_text:
+                break
+        else:
+            return
+        
+        for check, checked in ((self.spelling_mode, mode != "meaning"), (self.meaning_mode, mode != "spelling")):
+            check.blockSignals(True)
+            check.setChecked(checked)
+            check.blockSignals(False)
+        self.study_mode = mode
+    
+    def save_study_mode(self):
+        """保存学习模式状态"""
+        self._save_mode_timer.stop()
+        QSettings().setValue(_state_key(self.db, 'study_mode'), self.study_mode_text())
+    
+    def collect_state(self, states):
+        """把学习页面的设置放入 states 一起保存，已排队的延迟保存随之取消"""
+        self._save_mode_timer.stop()
+        states['study_mode'] = self.study_mode_text()
+        states['difficulty_level'] = self.level_combo.currentText()
+    
+    def on_auto_play_changed(self, checked):
+        """自动发音开关改变"""
+        QSettings().setValue(_state_key(self.db, 'auto_play'), checked)
     
     def on_level_changed(self, level_text):
         """难度级别改变"""
-        self.db.save_system_state('difficulty_level', level_text)
+        QSettings().setValue(_state_key(self.db, 'difficulty_level'), level_text)
     
     def start_study(self):
         """开始学习"""
-        level = self.level_combo.currentText()
-        if level == "全部":
-            level = None
+        level = self.current_level()
         
-        self.current_words = self.db.get_words_for_review(limit=10, level=level)
+        # 优先使用后台预取好的同一难度的单词
+        prefetched, self._prefetched = self._prefetched, None
+        if prefetched and prefetched[0] == level and prefetched[1]:
+            rows = prefetched[1]
+        else:
+            rows = self.db.get_words_for_review(limit=_REVIEW_BATCH_SIZE, level=level)
         
-        if not self.current_words:
+        if not rows:
             QMessageBox.information(self, "提示", "没有可学习的单词！\n请稍后再试或选择其他难度。")
             return
         
+        # 一次拆成列，之后按下标直接读取
+        self._ids, self._words, self._prons, self._meanings = map(list, list(zip(*rows))[:4])
         self.current_index = 0
+        # 混合模式下每个单词的模式，整轮一次生成
+        self._mode_seq = [self._rng.choice(("spelling", "meaning")) for _ in rows]
         self.start_button.setText("学习中...")
         self.start_button.setEnabled(False)
         
-        word_data = self.current_words[self.current_index]
-        self.set_word(word_data)
+        self.set_word(self.current_index)
     
-    def set_word(self, word_data):
-        """设置当前单词"""
-        self.current_word = word_data
-        word_id, word, pronunciation, meaning, level = word_data[:5]
-        
-        # 随机选择模式（如果是混合模式）
+    def set_word(self, index):
+        """显示本轮第 index 个单词"""
+        self._current = index
+        word = self._words[index]
+        meaning = self._meanings[index]
+        pronunciation = self._prons[index]
+        
+        # 混合模式下使用本轮开始时预先随机好的模式
         if self.study_mode == "mixed":
-            current_mode = random.choice(["spelling", "meaning"])
+            current_mode = self._mode_seq[index]
         else:
             current_mode = self.study_mode
         
+        self._displayed_mode = current_mode
+        # 答案比较用的规范化小写形式，每个单词只计算一次
+        self._word_lc = word.translate(_NORMALIZE).lower()
+        self._meaning_lc = meaning.translate(_NORMALIZE).lower()
+        
         if current_mode == "spelling":
             self.word_label.setText(f"📖 {meaning}")
             self.input_edit.setPlaceholderText("请输入英文单词...")
@@ -1300,38 +1524,40 @@ class StudyWidget(QWidget):
         self.show_answer_button.setEnabled(True)
         self.next_button.setEnabled(False)
         
-        # 自动播放发音
-        QTimer.singleShot(500, lambda: self.tts_engine.speak(word))
+        # 自动播放发音（在播放线程中进行，不阻塞界面）
+        if self.auto_play_check.isChecked():
+            self.tts_engine.speak(word)
     
     def play_pronunciation(self):
         """播放发音"""
-        if self.current_word:
-            word = self.current_word[1]
-            self.tts_engine.speak(word)
+        if self._current >= 0:
+            self.tts_engine.speak(self._words[self._current])
     
     def check_answer(self):
         """检查答案"""
-        if not self.current_word:
+        # 本题已经判定过（回车连按、答完后等待下一个）时不再重复记录
+        if self._current < 0 or not self.check_button.isEnabled():
             return
         
-        user_input = self.input_edit.text().strip().lower()
-        word_id, word, pronunciation, meaning, level = self.current_word[:5]
+        # 空输入不算作答
+        user_input = self.input_edit.text().translate(_NORMALIZE).strip().lower()
+        if not user_input:
+            return
         
-        # 判断当前模式
-        if self.study_mode == "mixed":
-            if self.word_label.text().startswith("📖"):
-                current_mode = "spelling"
-            else:
-                current_mode = "meaning"
-        else:
-            current_mode = self.study_mode
+        # 先禁用检查和显示答案按钮，防止重复提交
+        self.check_button.setEnabled(False)
+        self.show_answer_button.setEnabled(False)
+        
+        i = self._current
+        word_id, word, pronunciation, meaning = self._ids[i], self._words[i], self._prons[i], self._meanings[i]
+        
+        # 当前单词显示时采用的模式
+        current_mode = self._displayed_mode
         
         if current_mode == "spelling":
-            correct_answer = word.lower()
-            is_correct = user_input == correct_answer
+            is_correct = user_input == self._word_lc
         else:
-            correct_answer = meaning
-            is_correct = user_input in meaning.lower()
+            is_correct = user_input in self._meaning_lc
         
         # 更新数据库
         self.db.update_word_progress(word_id, is_correct, current_mode)
@@ -1340,16 +1566,7 @@ class StudyWidget(QWidget):
         if is_correct:
             # 正确答案：显示简短提示后直接进入下一个
             self.result_label.setText("✅ 正确！")
-            self.result_label.setStyleSheet("""
-                QLabel {
-                    background-color: #2ecc71;
-                    color: white;
-                    border-radius: 15px;
-                    padding: 15px;
-                    margin: 10px 0;
-                    font-weight: bold;
-                }
-            """)
+            self.set_result_state("correct")
             
             # 1秒后自动进入下一个单词
             QTimer.singleShot(1000, self.next_word)
@@ -1367,71 +1584,36 @@ class StudyWidget(QWidget):
                 self.word_label.setText(f"📖 {meaning}")
                 self.pronunciation_label.setText(f"🔤 {word}")
             
-            self.result_label.setStyleSheet("""
-                QLabel {
-                    background-color: #e74c3c;
-                    color: white;
-                    border-radius: 15px;
-                    padding: 15px;
-                    margin: 10px 0;
-                    font-weight: bold;
-                }
-            """)
+            self.set_result_state("wrong")
             
             # 播放正确答案的发音
             self.tts_engine.speak(word)
             
             # 启用下一个按钮
             self.next_button.setEnabled(True)
-        
-        # 禁用检查和显示答案按钮
-        self.check_button.setEnabled(False)
-        self.show_answer_button.setEnabled(False)
     
     def show_answer(self):
         """显示答案"""
-        if not self.current_word:
+        if self._current < 0:
             return
         
-        word_id, word, pronunciation, meaning, level = self.current_word[:5]
+        i = self._current
+        word_id, word, pronunciation, meaning = self._ids[i], self._words[i], self._prons[i], self._meanings[i]
         
-        # 判断当前模式
-        if self.study_mode == "mixed":
-            if self.word_label.text().startswith("📖"):
-                current_mode = "spelling"
-                self.result_label.setText(f"💡 答案是：{word}")
-                # 显示完整单词信息
-                self.word_label.setText(f"🔤 {word}")
-                self.pronunciation_label.setText(pronunciation or "")
-            else:
-                current_mode = "meaning"
-                self.result_label.setText(f"💡 答案是：{meaning}")
-                # 显示完整单词信息
-                self.word_label.setText(f"📖 {meaning}")
-                self.pronunciation_label.setText(f"🔤 {word}")
+        # 当前单词显示时采用的模式
+        current_mode = self._displayed_mode
+        if current_mode == "spelling":
+            self.result_label.setText(f"💡 答案是：{word}")
+            # 显示完整单词信息
+            self.word_label.setText(f"🔤 {word}")
+            self.pronunciation_label.setText(pronunciation or "")
         else:
-            if self.study_mode == "spelling":
-                self.result_label.setText(f"💡 答案是：{word}")
-                # 显示完整单词信息
-                self.word_label.setText(f"🔤 {word}")
-                self.pronunciation_label.setText(pronunciation or "")
-            else:
-                self.result_label.setText(f"💡 答案是：{meaning}")
-                # 显示完整单词信息
-                self.word_label.setText(f"📖 {meaning}")
-                self.pronunciation_label.setText(f"🔤 {word}")
-            current_mode = self.study_mode
+            self.result_label.setText(f"💡 答案是：{meaning}")
+            # 显示完整单词信息
+            self.word_label.setText(f"📖 {meaning}")
+            self.pronunciation_label.setText(f"🔤 {word}")
         
-        self.result_label.setStyleSheet("""
-            QLabel {
-                background-color: #f39c12;
-                color: white;
-                border-radius: 15px;
-                padding: 15px;
-                margin: 10px 0;
-                font-weight: bold;
-            }
-        """)
+        self.set_result_state("answer")
         
         # 播放单词发音
         self.tts_engine.speak(word)
@@ -1447,28 +1629,63 @@ class StudyWidget(QWidget):
     def next_word(self):
         """下一个单词"""
         self.current_index += 1
-        if self.current_index < len(self.current_words):
-            word_data = self.current_words[self.current_index]
-            self.set_word(word_data)
+        # 本轮进行到一半时开始预取下一轮
+        if self.current_index == len(self._ids) // 2:
+            self.prefetch_words()
+        if self.current_index < len(self._ids):
+            self.set_word(self.current_index)
         else:
             self.finish_study()
     
+    def set_result_state(self, state):
+        """切换结果标签的配色，样式由全局样式表按 state 属性选择"""
+        self.result_label.setProperty("state", state)
+        style = self.result_label.style()
+        style.unpolish(self.result_label)
+        style.polish(self.result_label)
+    
+    def current_level(self):
+        """当前选择的难度，"全部"对应None"""
+        level = self.level_combo.currentText()
+        return None if level == "全部" else level
+    
+    def prefetch_words(self):
+        """在线程池中获取下一轮的单词"""
+        if self._fetch_task is not None:
+            return  # 上一次预取尚未完成
+        
+        task = _FetchWordsTask(self.db, self._fetch_generation, self.current_level(), set(self._ids))
+        task.signals.finished.connect(self.on_words_prefetched)
+        self._fetch_task = task
+        self._pool.start(task)
+    
+    def cancel_prefetch(self):
+        """取消尚未开始的预取任务；已经在运行的任务保留引用，由线程池等待结束"""
+        if self._fetch_task is not None and self._pool.tryTake(self._fetch_task):
+            self._fetch_task = None
+    
+    def invalidate_prefetch(self):
+        """丢弃已经预取和正在预取的单词，学习进度被重置或退出登录时调用"""
+        self._fetch_generation += 1
+        self._prefetched = None
+        self.cancel_prefetch()
+    
+    def on_words_prefetched(self, generation, level, words):
+        """预取完成"""
+        self._fetch_task = None
+        if generation == self._fetch_generation:
+            self._prefetched = (level, words)
+    
     def finish_study(self):
         """完成学习"""
+        # 本轮结束时立即提交排队的进度，不等待批次凑满
+        self.db.flush(wait=False)
+        
         self.word_label.setText("🎉 学习完成！")
         self.pronunciation_label.setText("恭喜您完成了本轮学习！")
         self.input_edit.clear()
         self.result_label.setText("✨ 太棒了！继续保持学习的热情！")
-        self.result_label.setStyleSheet("""
-            QLabel {
-                background-color: #2ecc71;
-                color: white;
-                border-radius: 15px;
-                padding: 15px;
-                margin: 10px 0;
-                font-weight: bold;
-            }
-        """)
+        self.set_result_state("correct")
         
         self.start_button.setText("🚀 开始学习")
         self.start_button.setEnabled(True)
@@ -1481,6 +1698,7 @@ class StatisticsWidget(QWidget):
     def __init__(self, db):
         super().__init__()
         self.db = db
+        self._last_stats = None  # 上次显示的统计结果
         self.init_ui()
     
     def init_ui(self):
@@ -1489,7 +1707,7 @@ class StatisticsWidget(QWidget):
         layout.setContentsMargins(30, 30, 30, 30)
         
         title = QLabel("📊 学习统计")
-        title.setFont(QFont("Microsoft YaHei", 20, QFont.Weight.Bold))
+        title.setFont(_font(20, bold=True))
         title.setAlignment(Qt.AlignmentFlag.AlignCenter)
         title.setStyleSheet("color: #2c3e50; margin-bottom: 20px;")
         layout.addWidget(title)
@@ -1499,71 +1717,58 @@ class StatisticsWidget(QWidget):
         self.stats_layout = QGridLayout(self.stats_container)
         self.stats_layout.setSpacing(20)
         
+        # 卡片只创建一次，之后只更新数值标签
+        self._value_labels = {}
+        for i, (key, card_title, color) in enumerate(_STAT_CARDS):
+            card, self._value_labels[key] = self.create_stat_card(card_title, color)
+            self.stats_layout.addWidget(card, i // 3, i % 3)
+        
         layout.addWidget(self.stats_container)
         layout.addStretch()
         self.setLayout(layout)
         
         self.update_statistics()
     
-    def create_stat_card(self, title, value, color):
-        """创建统计卡片"""
+    def create_stat_card(self, title, color):
+        """创建统计卡片，返回卡片和其中的数值标签"""
         card = QWidget()
         card.setFixedHeight(120)
-        card.setStyleSheet(f"""
-            QWidget {{
-                background-color: {color};
-                border-radius: 15px;
-                margin: 5px;
-            }}
-        """)
+        card.setObjectName("statCard")
+        card.setProperty("cardColor", color)
         
         card_layout = QVBoxLayout(card)
         card_layout.setContentsMargins(20, 20, 20, 20)
         
         title_label = QLabel(title)
-        title_label.setFont(QFont("Microsoft YaHei", 12, QFont.Weight.Bold))
-        title_label.setStyleSheet("color: white;")
+        title_label.setFont(_font(12, bold=True))
         title_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         
-        value_label = QLabel(str(value))
-        value_label.setFont(QFont("Microsoft YaHei", 24, QFont.Weight.Bold))
-        value_label.setStyleSheet("color: white;")
+        value_label = QLabel()
+        value_label.setFont(_font(24, bold=True))
         value_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         
         card_layout.addWidget(title_label)
         card_layout.addWidget(value_label)
         
-        return card
+        return card, value_label
     
     def update_statistics(self):
         """更新统计数据"""
-        # 清除现有卡片
-        for i in reversed(range(self.stats_layout.count())):
-            self.stats_layout.itemAt(i).widget().setParent(None)
-        
-        # 获取统计数据
+        # 获取统计数据；进度没有变化时数据库返回同一个缓存对象，无需更新
         stats = self.db.get_user_statistics()
         
-        if not stats:
+        if not stats or stats is self._last_stats:
             return
+        self._last_stats = stats
         
-        # 创建统计卡片
-        cards = [
-            ("📚 总单词数", stats['total_words'], "#3498db"),
-            ("✅ 已学习", stats['studied_words'], "#2ecc71"),
-            ("🏆 已掌握", stats['mastered_words'], "#9b59b6"),
-            ("🎯 今日学习", stats['today_studied'], "#e74c3c"),
-            ("🎖️ 正确率", f"{stats['accuracy']}%", "#f39c12"),
-            ("📈 学习进度", f"{round(stats['mastered_words']/max(stats['total_words'], 1)*100, 1)}%", "#1abc9c")
-        ]
-        
-        for i, (title, value, color) in enumerate(cards):
-            card = self.create_stat_card(title, value, color)
-            row, col = i // 3, i % 3
-            self.stats_layout.addWidget(card, row, col)
+        for key, value_label in self._value_labels.items():
+            value = stats[key]
+            value_label.setText(f"{value}%" if key in _PERCENT_STATS else str(value))
 
 class SettingsWidget(QWidget):
     """设置界面"""
+    progress_reset = pyqtSignal()  # 学习进度被重置
+    
     def __init__(self, db):
         super().__init__()
         self.db = db
@@ -1575,29 +1780,13 @@ class SettingsWidget(QWidget):
         layout.setContentsMargins(30, 30, 30, 30)
         
         title = QLabel("⚙️ 设置")
-        title.setFont(QFont("Microsoft YaHei", 20, QFont.Weight.Bold))
+        title.setFont(_font(20, bold=True))
         title.setAlignment(Qt.AlignmentFlag.AlignCenter)
         title.setStyleSheet("color: #2c3e50; margin-bottom: 20px;")
         layout.addWidget(title)
         
         # 用户信息
         user_group = QGroupBox("👤 用户信息")
-        user_group.setStyleSheet("""
-            QGroupBox {
-                font-weight: bold;
-                border: 2px solid #3498db;
-                border-radius: 10px;
-                margin-top: 10px;
-                padding-top: 10px;
-                background-color: #f8f9fa;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 20px;
-                padding: 0 10px 0 10px;
-                color: #2c3e50;
-            }
-        """)
         user_layout = QVBoxLayout()
         
         user_info = self.db.get_user_info()
@@ -1613,7 +1802,6 @@ class SettingsWidget(QWidget):
         
         # 数据管理
         data_group = QGroupBox("📊 数据管理")
-        data_group.setStyleSheet(user_group.styleSheet())
         data_layout = QVBoxLayout()
         
         reset_button = QPushButton("🔄 重置学习进度")
@@ -1655,7 +1843,6 @@ class SettingsWidget(QWidget):
         
         # 关于
         about_group = QGroupBox("ℹ️ 关于")
-        about_group.setStyleSheet(user_group.styleSheet())
         about_layout = QVBoxLayout()
         
         about_text = QLabel("""
@@ -1692,16 +1879,8 @@ class SettingsWidget(QWidget):
                                    QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
         
         if reply == QMessageBox.StandardButton.Yes:
-            conn = sqlite3.connect(self.db.db_path)
-            cursor = conn.cursor()
-            
-            # 清空当前用户的学习记录
-            cursor.execute('DELETE FROM study_records WHERE user_id = ?', (self.db.current_user_id,))
-            cursor.execute('DELETE FROM user_word_progress WHERE user_id = ?', (self.db.current_user_id,))
-            
-            conn.commit()
-            conn.close()
-            
+            self.db.reset_user_progress()
+            self.progress_reset.emit()
             QMessageBox.information(self, "重置完成", "学习进度已重置！")
     
     def logout(self):
@@ -1711,189 +1890,252 @@ class SettingsWidget(QWidget):
                                    QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
         
         if reply == QMessageBox.StandardButton.Yes:
+            # 关闭主窗口，由closeEvent保存当前用户的界面状态后再退出登录；
+            # 最后一个窗口关闭后应用随之退出
+            self.window().close()
             self.db.current_user_id = None
-            QApplication.quit()
+
+# 切换标签页后延迟保存窗口状态的毫秒数
+_SAVE_STATE_DELAY_MS = 500
+
+# 答题后状态栏的提示及显示时长
+_MSG_CORRECT = "回答正确！继续加油！"
+_MSG_WRONG = "继续努力，熟能生巧！"
+_STATUS_MESSAGE_MS = 3000
+
+class _LoginCancelled(Exception):
+    """登录对话框被取消，不再创建主窗口"""
 
 class WordMemoryApp(QMainWindow):
     """主应用程序"""
     def __init__(self):
         super().__init__()
         self.db = UserDatabase()
+        self.db.signals.write_failed.connect(self.on_write_failed)
         
         # 显示登录对话框
         login_dialog = LoginDialog(self.db)
         if login_dialog.exec() != QDialog.DialogCode.Accepted:
-            sys.exit()
+            self.db.close()
+            raise _LoginCancelled()
         
         self.init_ui()
-        self.load_system_state()
     
     def init_ui(self):
         self.setWindowTitle("单词记忆助手 v2.0 - 多用户版")
         
-        # 设置默认字体
-        font = QFont("Microsoft YaHei", 10)
-        font.setHintingPreference(QFont.HintingPreference.PreferFullHinting)
-        QApplication.setFont(font)
-        
-        # 从系统状态加载窗口几何信息，如果没有则使用默认值
-        saved_geometry = self.db.load_system_state('window_geometry', [100, 100, 1000, 700])
-        self.setGeometry(*saved_geometry)
+        self.migrate_system_state()
+        # 启动时一次读出全部界面状态，之后按键取值
+        self._saved_state = self.read_system_state()
         
-        # 设置应用样式
-        self.setStyleSheet("""
-            QMainWindow {
-                background-color: #f5f5f5;
-                font-family: "Microsoft YaHei", "SimHei", "Arial Unicode MS", sans-serif;
-            }
-            QTabWidget::pane {
-                border: 1px solid #c0c0c0;
-                background-color: white;
-                border-radius: 8px;
-            }
-            QTabBar::tab {
-                background-color: #e1e1e1;
-                padding: 12px 20px;
-                margin-right: 2px;
-                border-top-left-radius: 8px;
-                border-top-right-radius: 8px;
-                font-weight: bold;
-                font-family: "Microsoft YaHei", "SimHei", sans-serif;
-                font-size: 12px;
-            }
-            QTabBar::tab:selected {
-                background-color: white;
-                border-bottom: 3px solid #3498db;
-            }
-            QTabBar::tab:hover {
-                background-color: #d5d5d5;
-            }
-            QLabel {
-                font-family: "Microsoft YaHei", "SimHei", sans-serif;
-            }
-            QPushButton {
-                font-family: "Microsoft YaHei", "SimHei", sans-serif;
-            }
-            QLineEdit {
-                font-family: "Microsoft YaHei", "SimHei", sans-serif;
-            }
-            QComboBox {
-                font-family: "Microsoft YaHei", "SimHei", sans-serif;
-            }
-        """)
+        # 从系统状态加载窗口几何信息（Qt的二进制格式）；没有时使用旧版本保存的
+        # [x, y, 宽, 高] 列表，再没有则使用默认值
+        geometry = self._saved_state.get('geometry')
+        if geometry is None or not self.restoreGeometry(geometry):
+            saved_geometry = self._saved_state.get('window_geometry', [100, 100, 1000, 700])
+            self.setGeometry(*(int(v) for v in saved_geometry))
         
-        # 创建标签页
+        # 创建标签页，各页面先用占位控件，第一次切换到该标签时才创建
         self.tab_widget = QTabWidget()
-        self.tab_widget.currentChanged.connect(self.on_tab_changed)
-        
-        # 学习页面
-        self.study_widget = StudyWidget(self.db)
-        self.study_widget.word_completed.connect(self.on_word_completed)
-        self.tab_widget.addTab(self.study_widget, "📚 学习")
-        
-        # 统计页面
-        self.statistics_widget = StatisticsWidget(self.db)
-        self.tab_widget.addTab(self.statistics_widget, "📊 统计")
-        
-        # 设置页面
-        self.settings_widget = SettingsWidget(self.db)
-        self.tab_widget.addTab(self.settings_widget, "⚙️ 设置")
+        self.study_widget = None
+        self.statistics_widget = None
+        self.settings_widget = None
+        self._stats_dirty = True  # 统计页面显示的数据是否已过时
+        self._stats_date = None
+        self._tab_factories = {
+            0: self.create_study_widget,
+            1: self.create_statistics_widget,
+            2: self.create_settings_widget,
+        }
+        for title in ("📚 学习", "📊 统计", "⚙️ 设置"):
+            placeholder = QWidget()
+            placeholder_layout = QVBoxLayout(placeholder)
+            placeholder_layout.setContentsMargins(0, 0, 0, 0)
+            self.tab_widget.addTab(placeholder, title)
         
         self.setCentralWidget(self.tab_widget)
         
+        # 窗口状态的延迟保存
+        self._save_state_timer = QTimer(self)
+        self._save_state_timer.setSingleShot(True)
+        self._save_state_timer.setInterval(_SAVE_STATE_DELAY_MS)
+        self._save_state_timer.timeout.connect(self.save_system_state)
+        
         # 从系统状态加载当前标签页
-        saved_tab = self.db.load_system_state('current_tab', 0)
+        saved_tab = int(self._saved_state.get('current_tab', 0))
         self.tab_widget.setCurrentIndex(saved_tab)
+        self.ensure_tab(self.tab_widget.currentIndex())
+        self.tab_widget.currentChanged.connect(self.on_tab_changed)
+        
+        # 建索引和ANALYZE放到事件循环开始、窗口显示之后再做
+        QTimer.singleShot(0, self.db.finish_init)
         
         # 设置状态栏
         user_info = self.db.get_user_info()
         if user_info:
             username = user_info[0]
             self.statusBar().showMessage(f"欢迎使用单词记忆助手，{username}！")
-            
-        # 设置状态栏字体
-        self.statusBar().setStyleSheet("""
-            QStatusBar {
-                font-family: "Microsoft YaHei", "SimHei", sans-serif;
-                font-size: 11px;
-                color: #2c3e50;
-            }
-        """)
+    
+    def create_study_widget(self):
+        """创建学习页面"""
+        self.study_widget = StudyWidget(self.db)
+        self.study_widget.word_completed.connect(self.on_word_completed)
+        self.load_system_state()
+        return self.study_widget
+    
+    def create_statistics_widget(self):
+        """创建统计页面"""
+        self.statistics_widget = StatisticsWidget(self.db)
+        # 页面创建时已经统计过一次，切换到该页时不必再统计
+        self._stats_dirty = False
+        self._stats_date = date.today()
+        return self.statistics_widget
+    
+    def create_settings_widget(self):
+        """创建设置页面"""
+        self.settings_widget = SettingsWidget(self.db)
+        self.settings_widget.progress_reset.connect(self.on_progress_reset)
+        return self.settings_widget
+    
+    def ensure_tab(self, index):
+        """标签页第一次显示时创建真正的页面，放入占位控件中"""
+        factory = self._tab_factories.pop(index, None)
+        if factory:
+            self.tab_widget.widget(index).layout().addWidget(factory())
+    
+    def migrate_system_state(self):
+        """旧版本把界面状态保存在数据库的 system_state 表中，第一次启动时复制到QSettings"""
+        settings = QSettings()
+        # 自动发音偏好曾经是全局设置，用户还没有自己的设置时沿用旧值
+        auto_play_key = _state_key(self.db, 'auto_play')
+        if settings.contains(_LEGACY_AUTO_PLAY_KEY) and not settings.contains(auto_play_key):
+            settings.setValue(auto_play_key, settings.value(_LEGACY_AUTO_PLAY_KEY, True, type=bool))
+        
+        migrated_key = _state_key(self.db, 'migrated')
+        if settings.value(migrated_key, False, type=bool):
+            return
+        
+        for key, value in self.db.get_all_system_states().items():
+            settings.setValue(_state_key(self.db, key), value)
+        settings.setValue(migrated_key, True)
+    
+    def read_system_state(self):
+        """一次读出当前用户保存的全部界面状态，返回字典"""
+        settings = QSettings()
+        settings.beginGroup(_state_group(self.db))
+        state = {key: settings.value(key) for key in settings.childKeys()}
+        settings.endGroup()
+        return state
     
     def load_system_state(self):
-        """加载系统状态"""
+        """加载学习页面的系统状态"""
         try:
             # 加载学习模式设置
-            study_mode = self.db.load_system_state('study_mode', '拼写练习')
-            if hasattr(self.study_widget, 'mode_combo'):
-                index = self.study_widget.mode_combo.findText(study_mode)
-                if index >= 0:
-                    self.study_widget.mode_combo.setCurrentIndex(index)
+            study_mode = self._saved_state.get('study_mode', '拼写练习')
+            self.study_widget.apply_study_mode(study_mode)
             
             # 加载难度级别设置
-            difficulty_level = self.db.load_system_state('difficulty_level', '全部')
-            if hasattr(self.study_widget, 'level_combo'):
-                index = self.study_widget.level_combo.findText(difficulty_level)
-                if index >= 0:
-                    self.study_widget.level_combo.setCurrentIndex(index)
+            difficulty_level = self._saved_state.get('difficulty_level', '全部')
+            index = self.study_widget.level_combo.findText(difficulty_level)
+            if index >= 0:
+                self.study_widget.level_combo.setCurrentIndex(index)
                     
         except Exception as e:
             print(f"加载系统状态时出错: {e}")
     
     def save_system_state(self):
-        """保存系统状态"""
+        """保存系统状态到QSettings，由QSettings在后台统一写入磁盘"""
+        self._save_state_timer.stop()
         try:
-            # 保存窗口几何信息
-            geometry = self.geometry()
-            self.db.save_system_state('window_geometry', [geometry.x(), geometry.y(), geometry.width(), geometry.height()])
-            
-            # 保存当前标签页
-            self.db.save_system_state('current_tab', self.tab_widget.currentIndex())
+            states = {
+                # 窗口几何信息
+                'geometry': self.saveGeometry(),
+                # 当前标签页
+                'current_tab': self.tab_widget.currentIndex(),
+            }
             
-            # 保存学习设置
-            if hasattr(self.study_widget, 'mode_combo'):
-                self.db.save_system_state('study_mode', self.study_widget.mode_combo.currentText())
+            # 学习设置（学习页面尚未创建时没有可保存的设置）
+            if self.study_widget is not None:
+                self.study_widget.collect_state(states)
             
-            if hasattr(self.study_widget, 'level_combo'):
-                self.db.save_system_state('difficulty_level', self.study_widget.level_combo.currentText())
+            settings = QSettings()
+            for key, value in states.items():
+                settings.setValue(_state_key(self.db, key), value)
                 
         except Exception as e:
             print(f"保存系统状态时出错: {e}")
     
     def closeEvent(self, event):
-        """窗口关闭事件"""
+        """窗口关闭事件（包括退出登录）"""
         self.save_system_state()
+        # 预取的单词属于当前用户，关闭后不再使用
+        if self.study_widget is not None:
+            self.study_widget.invalidate_prefetch()
         event.accept()
     
+    def shutdown(self):
+        """应用退出前调用：等后台预取结束，再提交排队的进度并关闭数据库"""
+        if self.study_widget is not None:
+            self.study_widget.cancel_prefetch()
+        QThreadPool.globalInstance().waitForDone()
+        self.db.close()
+    
+    def on_progress_reset(self):
+        """学习进度被重置：预取的单词和统计结果都已过时"""
+        if self.study_widget is not None:
+            self.study_widget.invalidate_prefetch()
+        self._stats_dirty = True
+    
     def on_word_completed(self, word_id, is_correct, study_mode):
         """单词学习完成回调"""
-        if is_correct:
-            self.statusBar().showMessage("回答正确！继续加油！", 3000)
-        else:
-            self.statusBar().showMessage("继续努力，熟能生巧！", 3000)
+        self._stats_dirty = True
+        message = _MSG_CORRECT if is_correct else _MSG_WRONG
+        # 每次都重新显示，提示从最近一次答题起计时
+        self.statusBar().showMessage(message, _STATUS_MESSAGE_MS)
+    
+    def on_write_failed(self, error):
+        """后台写入学习进度失败，在状态栏提示用户，直到下一条提示出现"""
+        self._stats_dirty = True
+        self.statusBar().showMessage(f"⚠️ 学习进度保存失败，本次答题记录未能保存: {error}")
     
     def on_tab_changed(self, index):
         """标签页切换回调"""
-        if index == 1:  # 统计页面
+        self.ensure_tab(index)
+        
+        # 统计页面：学习进度有变化或日期变了才重新统计
+        if index == 1 and (self._stats_dirty or self._stats_date != date.today()):
             self.statistics_widget.update_statistics()
+            self._stats_dirty = False
+            self._stats_date = date.today()
         
-        # 保存当前标签页状态
-        self.db.save_system_state('current_tab', index)
+        # 延迟保存，快速切换标签时只写一次
+        self._save_state_timer.start()
 
 def main():
     app = QApplication(sys.argv)
     app.setApplicationName("单词记忆助手")
     app.setOrganizationName("WordMemory")
     
+    # 设置默认字体，在创建任何窗口之前设置，不会向已有控件广播字体变化
+    # 后备字体族代替样式表中的 font-family 列表
+    font = QFont("Microsoft YaHei", 10)
+    font.setFamilies(["Microsoft YaHei", "SimHei", "Arial Unicode MS"])
+    font.setHintingPreference(QFont.HintingPreference.PreferFullHinting)
+    app.setFont(font)
+    
     # 设置应用图标
     app.setWindowIcon(QIcon())
+    app.setStyleSheet(_GLOBAL_QSS)
     
     try:
         window = WordMemoryApp()
-        window.show()
-        sys.exit(app.exec())
-    except SystemExit:
-        pass
+    except _LoginCancelled:
+        return
+    
+    # 退出前提交后台排队的学习进度
+    app.aboutToQuit.connect(window.shutdown)
+    window.show()
+    sys.exit(app.exec())
 
 if __name__ == "__main__":
     main()
\ No newline at end of file